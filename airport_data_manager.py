@@ -6,12 +6,15 @@ Handles fetching, processing, and storing airport weather data.
 """
 
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from metar_api_client import METARAPIClient, APIRequestFailed
 from airport_utils import calculate_airport_crosswind
 from metar_processor import determine_flight_category
-from taf_processor import process_taf_data as process_taf_data_module
+from taf_processor import process_taf_data as process_taf_data_module, new_forecast_slot, get_most_recent_taf
 from weather_status import determine_status_color
+from response_cache import ResponseCache
+from constants import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, DEFAULT_CACHE_STALE_WINDOW
 
 
 class AirportDataManager:
@@ -29,76 +32,132 @@ class AirportDataManager:
             base_taf_url=config["taf_url"]
         )
         
-        # Create airport name mapping
+        # Optional on-disk cache of API responses, served stale-while-revalidate
+        self.response_cache = None
+        cache_ttl = config.get("cache_ttl", DEFAULT_CACHE_TTL)
+        if cache_ttl > 0:
+            self.response_cache = ResponseCache(
+                config.get("cache_dir", DEFAULT_CACHE_DIR),
+                cache_ttl,
+                config.get("cache_stale_window", DEFAULT_CACHE_STALE_WINDOW)
+            )
+        
+        # Create airport name mapping and the station list sent with every batched request
         self.airport_names = {airport["icao"]: airport["name"] for airport in config["airports"]}
+        self.airport_ids = [airport["icao"] for airport in config["airports"]]
+        
+        # Pre-allocate one forecast slot per airport and forecast hour; these are
+        # refilled in place on every refresh instead of building new dictionaries
+        forecast_hours = config.get("forecast_hours", [])
+        if not isinstance(forecast_hours, list):
+            forecast_hours = [forecast_hours]
+        self.forecast_slots = {
+            icao: {hours: new_forecast_slot() for hours in forecast_hours}
+            for icao in self.airport_names
+        }
+        
+        # Hashes of the last processed raw METAR/TAF text per airport (the TAF
+        # paired with the forecast hours it was processed for), used to skip
+        # classification when the upstream report has not changed
+        self._metar_hashes = {}
+        self._taf_hashes = {}
     
     def fetch_and_process_data(self):
         """Fetch and process METAR and TAF data for all configured airports"""
-        airports = [airport["icao"] for airport in self.config["airports"]]
+        airports = self.airport_ids
         
-        # Reset data
+        # Reset data, keeping the previous results for unchanged reports
+        previous_data = self.airport_data
         self.airport_data = {}
+        # Reference time for every forecast lookup in this refresh
         self.last_update = datetime.now()
         
-        # Fetch METAR data
-        airport_metars = self._fetch_raw_metar_data(airports)
+        # Fetch METAR and TAF data concurrently; both are network bound and
+        # each request already covers every airport
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            metar_future = executor.submit(self._fetch_raw_metar_data, airports)
+            taf_future = executor.submit(self._fetch_all_taf_data, airports)
+            airport_metars = metar_future.result()
+            all_taf_data = taf_future.result()
+        
         if not airport_metars:
             self.logger.error("No METAR data was retrieved.")
             return False
-            
-        # Fetch TAF data
-        all_taf_data = self._fetch_all_taf_data(airports)
         
         # Process each airport's data
         for station_id, metar_data in airport_metars.items():
             if station_id in self.airport_names:
                 taf_data = all_taf_data.get(station_id, None)
-                self._process_airport_data(station_id, metar_data, taf_data, self.airport_names[station_id])
+                self._process_airport_data(station_id, metar_data, taf_data, self.airport_names[station_id],
+                                           previous_data.get(station_id))
+        
+        # One summary line per refresh instead of one log record per airport
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Processed %d airports: %s", len(self.airport_data),
+                             ",".join(f"{icao}={data['flight_category']}" for icao, data in self.airport_data.items()))
         
         return len(self.airport_data) > 0
     
+    def _cached_fetch(self, key, airports, fetch):
+        """Fetch from the API through the response cache, if enabled"""
+        if self.response_cache is None:
+            return fetch(airports)
+        return self.response_cache.get(key, airports, lambda: fetch(airports))
+    
     def _fetch_raw_metar_data(self, airports):
         """Fetch raw METAR data from the API"""
         try:
             self.logger.info("Fetching METAR data for %d airports", len(airports))
-            all_metar_data = self.api_client.fetch_metar_data(airports)
+            all_metar_data = self._cached_fetch("metar", airports, self.api_client.fetch_metar_data)
             airport_metars = self.api_client.get_most_recent_metars(all_metar_data)
             self.logger.info("Successfully retrieved METAR data for %d airports", len(airport_metars))
             return airport_metars
         except APIRequestFailed as e:
-            self.logger.error("API request failed: %s", str(e))
+            self.logger.error("API request failed: %s", e)
             return {}
         except Exception as e:
-            self.logger.exception("Unexpected error fetching METAR data: %s", str(e))
+            self.logger.exception("Unexpected error fetching METAR data: %s", e)
             return {}
     
     def _fetch_all_taf_data(self, airports):
         """Fetch TAF data for all airports"""
         try:
             self.logger.info("Fetching TAF data for %d airports", len(airports))
-            taf_data_list = self.api_client.fetch_taf_data(airports)
+            taf_data_list = self._cached_fetch("taf", airports, self.api_client.fetch_taf_data)
             all_taf_data = self.api_client.group_tafs_by_airport(taf_data_list)
             self.logger.info("Successfully retrieved TAF data for %d airports", len(all_taf_data))
             return all_taf_data
         except APIRequestFailed as e:
-            self.logger.error("TAF API request failed: %s", str(e))
+            self.logger.error("TAF API request failed: %s", e)
             return {}
         except Exception as e:
-            self.logger.exception("Unexpected error fetching TAF data: %s", str(e))
+            self.logger.exception("Unexpected error fetching TAF data: %s", e)
             return {}
     
-    def _process_airport_data(self, station_id, metar_data, taf_data, airport_name):
+    def _metar_unchanged(self, station_id, metar_hash, previous):
+        """Check whether a METAR hash matches the report processed on the last refresh"""
+        return previous is not None and self._metar_hashes.get(station_id) == metar_hash
+    
+    def _process_airport_data(self, station_id, metar_data, taf_data, airport_name, previous=None):
         """Process METAR and TAF data for a single airport"""
         raw_text = metar_data.get("rawOb")
+        metar_hash = hash(raw_text)
         
-        # Determine flight category
-        flight_category = determine_flight_category(metar_data)
-        
-        # Calculate crosswind
-        wind_data = calculate_airport_crosswind(self.config, station_id, raw_text)
-        
-        # Determine status color
-        status_color = determine_status_color(raw_text, flight_category, wind_data)
+        if self._metar_unchanged(station_id, metar_hash, previous):
+            # Same report as last refresh - reuse the previous classification
+            flight_category = previous["flight_category"]
+            wind_data = previous["wind_data"]
+            status_color = previous["status_color"]
+        else:
+            # Determine flight category
+            flight_category = determine_flight_category(metar_data)
+            
+            # Calculate crosswind
+            wind_data = calculate_airport_crosswind(self.config, station_id, raw_text)
+            
+            # Determine status color
+            status_color = determine_status_color(raw_text, flight_category, wind_data)
+            self._metar_hashes[station_id] = metar_hash
         
         # Initialize airport data
         self.airport_data[station_id] = {
@@ -114,9 +173,23 @@ class AirportDataManager:
         
         # Process TAF data if available
         if taf_data:
-            self._process_taf_data(station_id, taf_data)
+            self._process_taf_data(station_id, taf_data, previous)
     
-    def _process_taf_data(self, airport, taf_data_list):
+    def _forecasts_current(self, forecasts, forecast_hours):
+        """Check whether cached forecasts still cover their target times"""
+        if not forecasts:
+            return False
+        
+        now = self.last_update or datetime.now()
+        for hours, forecast in forecasts.items():
+            if hours not in forecast_hours:
+                return False
+            target_time = now + timedelta(hours=hours)
+            if not forecast["time_from"] <= target_time <= forecast["time_to"]:
+                return False
+        return True
+    
+    def _process_taf_data(self, airport, taf_data_list, previous=None):
         """Process TAF data for a specific airport"""
         try:
             self.logger.debug("Processing TAF data for %s", airport)
@@ -124,9 +197,25 @@ class AirportDataManager:
             forecast_hours = self.config["forecast_hours"]
             if not isinstance(forecast_hours, list):
                 forecast_hours = [forecast_hours]
+            
+            # Reuse the previous forecasts if the TAF and the requested forecast
+            # hours are unchanged and each forecast period still covers its target time
+            most_recent_taf = get_most_recent_taf(taf_data_list)
+            taf_hash = (hash(most_recent_taf.get("rawTAF")) if most_recent_taf else None, tuple(forecast_hours))
+            if (previous is not None and self._taf_hashes.get(airport) == taf_hash and
+                    self._forecasts_current(previous.get("forecasts"), forecast_hours)):
+                for key in ("forecast", "forecasts", "forecast_category", "forecast_color", "forecast_taf_summary"):
+                    if key in previous:
+                        self.airport_data[airport][key] = previous[key]
+                self.logger.debug("TAF unchanged for %s, reusing forecasts", airport)
+                return
+            self._taf_hashes[airport] = taf_hash
                 
             # Use the taf_processor module
-            taf_data = process_taf_data_module(airport, taf_data_list, forecast_hours)
+            now = self.last_update or datetime.now()
+            taf_data = process_taf_data_module(
+                airport, taf_data_list, forecast_hours, self.forecast_slots.get(airport), now.timestamp()
+            )
             
             # Store the results
             if taf_data["forecast"]:
@@ -142,9 +231,9 @@ class AirportDataManager:
                     # Determine status color with crosswind information
                     forecast_color = determine_status_color(forecast_text, forecast_category, wind_data)
                     
-                    # Store the forecast information with color
-                    self.airport_data[airport]["forecasts"][hours] = forecast.copy()
-                    self.airport_data[airport]["forecasts"][hours]["color"] = forecast_color
+                    # Store the forecast information with color (the slot is reused, not copied)
+                    forecast["color"] = forecast_color
+                    self.airport_data[airport]["forecasts"][hours] = forecast
                     
                     # For backward compatibility
                     if hours == 6 or "forecast_category" not in self.airport_data[airport]:
@@ -157,4 +246,4 @@ class AirportDataManager:
                 self.logger.warning("No valid TAF data found for %s", airport)
             
         except Exception as e:
-            self.logger.exception("Error processing TAF data for %s: %s", airport, str(e))
\ No newline at end of file
+            self.logger.exception("Error processing TAF data for %s: %s", airport, e)
\ No newline at end of file
@@ -11,6 +11,10 @@ import logging
 
 logger = logging.getLogger("airport_utils")
 
+# Wind groups, compiled once (e.g. VRB05KT, 27015KT or 27015G25KT)
+_VRB_WIND_RE = re.compile(r'VRB(\d{2})KT')
+_WIND_RE = re.compile(r'(\d{3})(\d{2})(?:G(\d+))?KT')
+
 def get_runway_data(config, icao):
     """Get runway data for a specific airport by ICAO code from config.
     
@@ -118,18 +122,19 @@ def extract_wind_data(raw_metar):
     if "VRB" in raw_metar:
         wind_data["variable"] = True
         # Try to extract speed from VRB format
-        vrb_match = re.search(r'VRB(\d{2})KT', raw_metar)
+        vrb_match = _VRB_WIND_RE.search(raw_metar)
         if vrb_match:
             wind_data["speed"] = int(vrb_match.group(1))
         return wind_data
     
     # Regular wind pattern (e.g., 27015KT or 27015G25KT)
-    wind_match = re.search(r'(\d{3})(\d{2})(?:G(\d+))?KT', raw_metar)
+    wind_match = _WIND_RE.search(raw_metar)
     if wind_match:
         wind_data["direction"] = int(wind_match.group(1))
         wind_data["speed"] = int(wind_match.group(2))
-        if wind_match.group(3):  # Gust data
-            wind_data["gust"] = int(wind_match.group(3))
+        gust = wind_match.group(3)
+        if gust:  # Gust data
+            wind_data["gust"] = int(gust)
     
     return wind_data
 
@@ -5,7 +5,6 @@ Provides GPIO button interface for Raspberry Pi to toggle display modes
 """
 
 import time
-import threading
 import logging
 
 # Configure logger
@@ -38,7 +37,6 @@ class ButtonHandler:
         self.callback = callback
         self.is_running = False
         self.last_press_time = 0
-        self.thread = None
         
         # Early exit if GPIO is not available
         if not GPIO_AVAILABLE:
@@ -58,7 +56,7 @@ class ButtonHandler:
             return
     
     def start(self):
-        """Start the button monitoring thread"""
+        """Start monitoring the button via GPIO edge detection"""
         if not GPIO_AVAILABLE:
             logger.warning("Button monitoring not started: GPIO not available")
             return False
@@ -68,10 +66,13 @@ class ButtonHandler:
             return False
             
         try:
+            # Falling edges are delivered by the GPIO library's interrupt thread,
+            # so nothing polls the pin; bouncetime handles debouncing
+            GPIO.add_event_detect(self.button_pin, GPIO.FALLING,
+                                  callback=self._on_press,
+                                  bouncetime=int(DEBOUNCE_TIME * 1000))
             self.is_running = True
-            self.thread = threading.Thread(target=self._monitor_button, daemon=True)
-            self.thread.start()
-            logger.info("Button monitoring thread started")
+            logger.info(f"Button monitoring started on GPIO pin {self.button_pin}")
             return True
         except Exception as e:
             logger.error(f"Error starting button monitoring: {str(e)}")
@@ -79,67 +80,36 @@ class ButtonHandler:
             return False
     
     def stop(self):
-        """Stop the button monitoring thread"""
+        """Stop monitoring the button"""
         if not self.is_running:
             return
             
         self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
         
         # Clean up GPIO if we're stopping
         if GPIO_AVAILABLE:
             try:
+                GPIO.remove_event_detect(self.button_pin)
                 GPIO.cleanup(self.button_pin)
             except Exception as e:
                 logger.error(f"Error cleaning up GPIO: {str(e)}")
                 
         logger.info("Button monitoring stopped")
     
-    def _monitor_button(self):
-        """Monitor the button for presses (runs in a separate thread)"""
-        logger.info(f"Button monitoring started on GPIO pin {self.button_pin}")
+    def _on_press(self, channel):
+        """Handle a falling edge on the button pin (runs on the GPIO event thread)"""
+        current_time = time.monotonic()
+        self.last_press_time = current_time
+        logger.info("Button pressed - executing callback")
         
-        try:
-            button_state_logged = False
-            while self.is_running:
-                current_state = GPIO.input(self.button_pin)
-                
-                # Log initial button state once for debugging
-                if not button_state_logged:
-                    logger.info(f"Button monitoring active, current state: {'HIGH' if current_state else 'LOW'}")
-                    button_state_logged = True
-                
-                # Wait for button press (falling edge)
-                if current_state == GPIO.LOW:
-                    # Check for debounce
-                    current_time = time.time()
-                    if (current_time - self.last_press_time) >= DEBOUNCE_TIME:
-                        self.last_press_time = current_time
-                        logger.info("Button pressed - executing callback")
-                        
-                        # Execute the callback if it exists
-                        if self.callback:
-                            try:
-                                self.callback()
-                            except Exception as e:
-                                logger.error(f"Error in button callback: {str(e)}")
-                        else:
-                            logger.warning("Button pressed but no callback configured")
-                    else:
-                        logger.debug(f"Button press ignored due to debounce (time since last: {current_time - self.last_press_time:.2f}s)")
-                    
-                    # Wait for button release
-                    while GPIO.input(self.button_pin) == GPIO.LOW and self.is_running:
-                        time.sleep(0.05)
-                    logger.debug("Button released")
-                        
-                # Small delay to prevent CPU hogging
-                time.sleep(0.05)
-                
-        except Exception as e:
-            logger.exception(f"Error in button monitoring thread: {str(e)}")
-            self.is_running = False
+        # Execute the callback if it exists
+        if self.callback:
+            try:
+                self.callback()
+            except Exception as e:
+                logger.error(f"Error in button callback: {str(e)}")
+        else:
+            logger.warning("Button pressed but no callback configured")
 
 # Function to simulate button press (useful for testing without actual hardware)
 def simulate_button_press(handler):
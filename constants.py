@@ -12,6 +12,14 @@ DEFAULT_LIGHT_SENSOR_UPDATE_INTERVAL = 30  # seconds
 DEFAULT_MIN_BRIGHTNESS = 10  # minimum LED brightness percentage
 DEFAULT_MAX_BRIGHTNESS = 100  # maximum LED brightness percentage
 
+# Fetch fresh data immediately when the display mode is toggled
+DEFAULT_REFRESH_ON_TOGGLE = False
+
+# On-disk API response cache (a TTL of 0 disables it)
+DEFAULT_CACHE_DIR = "~/.cache/metar_monitor"
+DEFAULT_CACHE_TTL = 0  # seconds a cached response is fresh
+DEFAULT_CACHE_STALE_WINDOW = 600  # seconds past the TTL a response is served while refreshing
+
 # Flight categories and their descriptions
 FLIGHT_CATEGORIES = {
     "VFR": "Visual Flight Rules",
@@ -97,16 +105,19 @@ class DisplayMode:
     
     @staticmethod
     def get_name(mode, forecast_hour=None):
-        """Get the name of a display mode"""
-        if mode == DisplayMode.METAR:
-            return "METAR (Current Conditions)"
-        elif mode == DisplayMode.TAF:
-            if forecast_hour:
-                return f"TAF {forecast_hour}-Hour Forecast"
-            else:
-                return "TAF Forecast"
-        elif mode == DisplayMode.AIRPORTS_VISITED:
-            return "Airports Visited"
-        elif mode == DisplayMode.TEST:
-            return "Test Mode (METAR Data Availability)"
-        return "Unknown"
+        """Get the name of a display mode
+        
+        forecast_hour is only used for the TAF mode, so callers can pass the
+        current forecast hour regardless of mode.
+        """
+        if mode == DisplayMode.TAF and forecast_hour:
+            return f"TAF {forecast_hour}-Hour Forecast"
+        return _DISPLAY_MODE_NAMES.get(mode, "Unknown")
+
+# Names of the display modes, looked up by DisplayMode.get_name
+_DISPLAY_MODE_NAMES = {
+    DisplayMode.METAR: "METAR (Current Conditions)",
+    DisplayMode.TAF: "TAF Forecast",
+    DisplayMode.AIRPORTS_VISITED: "Airports Visited",
+    DisplayMode.TEST: "Test Mode (METAR Data Availability)"
+}
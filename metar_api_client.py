@@ -13,16 +13,6 @@ import socket
 from urllib.error import URLError, HTTPError
 from typing import Dict, List, Any, Optional, Union, Callable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("metar_monitor.log"),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger("metar_api_client")
 
 class APIRequestFailed(Exception):
@@ -106,13 +96,13 @@ class METARAPIClient:
                 logger.warning("Socket timeout occurred")
                 last_exception = socket.timeout("Request timed out")
             except json.JSONDecodeError as e:
-                logger.warning("JSON decode error: %s", str(e))
+                logger.warning("JSON decode error: %s", e)
                 last_exception = e
             except ValueError as e:
-                logger.warning("Validation error: %s", str(e))
+                logger.warning("Validation error: %s", e)
                 last_exception = e
             except Exception as e:
-                logger.warning("Unexpected error: %s", str(e), exc_info=True)
+                logger.warning("Unexpected error: %s", e, exc_info=True)
                 last_exception = e
                 
             # If we get here, the request failed and we should retry
@@ -146,14 +136,14 @@ class METARAPIClient:
         Raises:
             APIRequestFailed: If the request fails after all retries
         """
-        # Convert list to comma-separated string
+        # All stations go in a single request as a comma-separated list
         airport_ids_str = ",".join(airport_ids)
         
         # Build the URL
         url = f"{self.base_metar_url}?ids={airport_ids_str}&format=json&hours={hours}"
         
         logger.info("Fetching METAR data for %d airports: %s", 
-                   len(airport_ids), ", ".join([x for x in airport_ids]))
+                   len(airport_ids), ", ".join(airport_ids))
         
         try:
             response = self._make_request(url)
@@ -175,7 +165,7 @@ class METARAPIClient:
             return response
             
         except Exception as e:
-            logger.error("Failed to fetch METAR data: %s", str(e))
+            logger.error("Failed to fetch METAR data: %s", e)
             raise
     
     def fetch_taf_data(self, airport_ids: List[str], hours: int = 12) -> List[Dict]:
@@ -191,14 +181,14 @@ class METARAPIClient:
         Raises:
             APIRequestFailed: If the request fails after all retries
         """
-        # Convert list to comma-separated string
+        # All stations go in a single request as a comma-separated list
         airport_ids_str = ",".join(airport_ids)
         
         # Build the URL
         url = f"{self.base_taf_url}?ids={airport_ids_str}&format=json&hours={hours}"
         
         logger.info("Fetching TAF data for %d airports: %s",
-                   len(airport_ids), ", ".join([x for x in airport_ids]))
+                   len(airport_ids), ", ".join(airport_ids))
         
         try:
             response = self._make_request(url)
@@ -220,7 +210,7 @@ class METARAPIClient:
             return response
             
         except Exception as e:
-            logger.error("Failed to fetch TAF data: %s", str(e))
+            logger.error("Failed to fetch TAF data: %s", e)
             raise
     
     def get_most_recent_metars(self, all_metar_data: List[Dict]) -> Dict[str, Dict]:
@@ -22,13 +22,15 @@ class ModeManager:
         self.forecast_hour_index = 0
         self.logger = logging.getLogger("mode_manager")
         
-        # Create airport to LED mapping
+        # Create airport to LED mapping and precompute the visited-mode colors
         self.airport_to_led = {}
+        self.visited_colors = {}
         for airport_info in config["airports"]:
             icao = airport_info["icao"]
             led_index = airport_info["led"]
             if led_index < config.get("led_count", 0):
                 self.airport_to_led[icao] = led_index
+            self.visited_colors[icao] = "GREEN" if airport_info.get("visited", False) else "RED"
         
         # Create legend LEDs mapping
         self.legend_leds = {}
@@ -38,7 +40,7 @@ class ModeManager:
                 color = legend_item["color"]
                 led = legend_item["led"]
                 self.legend_leds[led] = {"name": name, "color": color}
-            self.logger.debug(f"Initialized {len(self.legend_leds)} legend LEDs")
+            self.logger.debug("Initialized %d legend LEDs", len(self.legend_leds))
     
     def toggle_display_mode(self):
         """Cycle through display modes"""
@@ -50,7 +52,7 @@ class ModeManager:
             self.display_mode = DisplayMode.TAF
             self.forecast_hour_index = 0
             self.current_forecast_hour = forecast_hours[self.forecast_hour_index]
-            self.logger.info(f"Display mode changed to TAF {self.current_forecast_hour}-Hour Forecast")
+            self.logger.info("Display mode changed to TAF %d-Hour Forecast", self.current_forecast_hour)
         elif self.display_mode == DisplayMode.TAF:
             self.forecast_hour_index = (self.forecast_hour_index + 1) % len(forecast_hours)
             
@@ -59,7 +61,7 @@ class ModeManager:
                 self.logger.info("Display mode changed to Airports Visited")
             else:
                 self.current_forecast_hour = forecast_hours[self.forecast_hour_index]
-                self.logger.info(f"Display mode changed to TAF {self.current_forecast_hour}-Hour Forecast")
+                self.logger.info("Display mode changed to TAF %d-Hour Forecast", self.current_forecast_hour)
         elif self.display_mode == DisplayMode.AIRPORTS_VISITED:
             self.display_mode = DisplayMode.TEST
             self.logger.info("Display mode changed to Test Mode")
@@ -81,11 +83,14 @@ class ModeManager:
                    "Test"
         self.logger.info("Updating LED display in %s mode", mode_name)
         
-        # Update airport LEDs - always update all configured airports
-        for airport_icao, led_index in self.airport_to_led.items():
-            data = airport_data.get(airport_icao, {}) if airport_data else {}
-            status_color = self._get_led_color_for_mode(airport_icao, data)
-            self.led_controller.set_led(led_index, status_color)
+        # Update airport LEDs - always update all configured airports in one batch
+        if not airport_data:
+            airport_data = {}
+        get_color = self._get_led_color_for_mode
+        self.led_controller.set_leds(
+            (led_index, get_color(airport_icao, airport_data.get(airport_icao, {})))
+            for airport_icao, led_index in self.airport_to_led.items()
+        )
         
         # Update the legend LEDs
         if self.legend_leds:
@@ -93,6 +98,9 @@ class ModeManager:
             
         # Update mode LEDs
         self._update_mode_leds()
+        
+        # Push the whole frame to the strip in one update
+        self.led_controller.commit()
     
     def _get_led_color_for_mode(self, airport, data):
         """Get LED color based on current display mode"""
@@ -110,11 +118,7 @@ class ModeManager:
                     return data["forecasts"][closest_hour]["color"]
             return "GRAY"
         elif self.display_mode == DisplayMode.AIRPORTS_VISITED:
-            # Find airport config to check visited flag
-            for airport_config in self.config["airports"]:
-                if airport_config["icao"] == airport:
-                    return "GREEN" if airport_config.get("visited", False) else "RED"
-            return "RED"
+            return self.visited_colors.get(airport, "RED")
         else:  # DisplayMode.TEST
             return "GREEN" if data.get("raw_metar") else "RED"
     
@@ -128,9 +132,9 @@ class ModeManager:
             color = legend_item["color"]
             name = legend_item["name"]
             self.led_controller.set_led(led_index, color)
-            self.logger.debug(f"Set legend LED {led_index} to {color} ({name})")
+            self.logger.debug("Set legend LED %d to %s (%s)", led_index, color, name)
             
-        self.logger.info(f"Legend display initialized with {len(self.legend_leds)} LEDs")
+        self.logger.info("Legend display initialized with %d LEDs", len(self.legend_leds))
     
     def _update_mode_leds(self):
         """Update the mode LEDs"""
@@ -180,4 +184,4 @@ class ModeManager:
 
         if active_idx is not None and active_idx < self.config.get("led_count", 0):
             self.led_controller.set_led(active_idx, "WHITE")
-            self.logger.debug(f"Set mode LED {active_idx} to WHITE")
\ No newline at end of file
+            self.logger.debug("Set mode LED %d to WHITE", active_idx)
\ No newline at end of file
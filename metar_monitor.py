@@ -15,12 +15,16 @@ import signal
 import json
 import time
 import os
+import atexit
 import sys
 import logging
 import math
 import threading
+import queue
 import select
-from logging.handlers import TimedRotatingFileHandler
+import termios
+import tty
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from airport_data_manager import AirportDataManager
 from metar_display import DisplayManager
@@ -28,14 +32,13 @@ from metar_modes import ModeManager
 from constants import DisplayMode
 from constants import (
     COLORS, CATEGORY_COLOR_MAP, FLIGHT_CATEGORIES, 
-    THRESHOLDS, DEFAULT_BUTTON_PIN,
+    THRESHOLDS, DEFAULT_BUTTON_PIN, DEFAULT_REFRESH_ON_TOGGLE,
     DEFAULT_LIGHT_SENSOR_UPDATE_INTERVAL, DEFAULT_MIN_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS,
     CONFIG_FILE, DISPLAY_FORMATTING, MODE_INDICATOR_COLOR, MODE_NAMES
 )
 from light_sensor import LightSensor
 
 
-
 # Try to import the rpi_ws281x library for LED control
 LED_ENABLED = False
 LED_COLORS = {}
@@ -53,40 +56,68 @@ try:
         "OFF": Color(0, 0, 0)         # Off
     }
     LED_ENABLED = True
-    logging.info("LED support enabled")
 except ImportError:
-    logging.info("rpi_ws281x library not found. Running in console-only mode.")
+    pass
 
 class KeyboardHandler:
     def __init__(self, callback):
         self.callback = callback
         self.running = False
         self.thread = None
+        self.logger = logging.getLogger("keyboard_handler")
+        self._fd = None
+        self._wake_r = None
+        self._wake_w = None
+        self._saved_tty = None
     
     def start(self):
         self.running = True
+        self._fd = sys.stdin.fileno()
+        # Self-pipe used by stop() to wake the blocking select()
+        self._wake_r, self._wake_w = os.pipe()
+        # Deliver single keystrokes without waiting for Enter
+        if os.isatty(self._fd):
+            self._saved_tty = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
         self.thread = threading.Thread(target=self._input_loop, daemon=True)
         self.thread.start()
         return True
     
     def stop(self):
         self.running = False
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"\0")
+            self.thread.join(timeout=1.0)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+        if self._saved_tty is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_tty)
+            self._saved_tty = None
     
     def _input_loop(self):
         while self.running:
             try:
-                if select.select([sys.stdin], [], [], 0.1)[0]:
-                    key = sys.stdin.read(1)
-                    if key.lower() == 'm':
+                readable = select.select([self._fd, self._wake_r], [], [])[0]
+                if self._wake_r in readable:
+                    break
+                # Raw bytes straight from the fd, bypassing the text IO layer
+                keys = os.read(self._fd, 64)
+                if not keys:
+                    # stdin closed (e.g. running as a service)
+                    break
+                for key in keys:
+                    if key in b"mM":
                         self.callback()
-            except:
-                pass
+            except OSError as e:
+                self.logger.warning("Keyboard input stopped: %s", e)
+                break
 
-def load_config():
+def load_config(config_file=CONFIG_FILE):
     """Load configuration from file"""
-    if os.path.exists(CONFIG_FILE):
+    if os.path.exists(config_file):
         try:
-            with open(CONFIG_FILE, 'r') as f:
+            with open(config_file, 'r') as f:
                 config = json.load(f)
                 return config
         except Exception as e:
@@ -94,8 +125,8 @@ def load_config():
             print(f"Error loading configuration file: {e}")
             sys.exit(1)
     else:
-        logging.error(f"Configuration file '{CONFIG_FILE}' not found")
-        print(f"Error: Configuration file '{CONFIG_FILE}' not found. Please create it before running.")
+        logging.error(f"Configuration file '{config_file}' not found")
+        print(f"Error: Configuration file '{config_file}' not found. Please create it before running.")
         sys.exit(1)
 
 class LEDController:
@@ -105,7 +136,20 @@ class LEDController:
         self.initialized = False
         self.light_sensor = light_sensor
         self.current_brightness = config["led_brightness"]
-        self.last_brightness_update = 0
+        self.logger = logging.getLogger("led_controller")
+        # Monotonic time before which brightness is not re-read from the sensor
+        self._next_brightness_deadline = 0.0
+        
+        # Settings read on every LED/brightness update, bound once here
+        self._led_count = config["led_count"]
+        self._update_interval = config.get("light_sensor_update_interval", DEFAULT_LIGHT_SENSOR_UPDATE_INTERVAL)
+        self._min_b = config.get("min_brightness", DEFAULT_MIN_BRIGHTNESS)
+        self._max_b = config.get("max_brightness", DEFAULT_MAX_BRIGHTNESS)
+        # Next frame being built by set_led(); only the writer thread touches the strip
+        self._frame = None
+        # Single-slot queue of committed frames; a newer frame replaces one not yet shown
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._writer = None
         
         if LED_ENABLED:
             try:
@@ -122,67 +166,147 @@ class LEDController:
                 
                 # Initialize the library (must be called once before other functions)
                 self.strip.begin()
+                self._frame = [LED_COLORS["OFF"]] * self._led_count
+                self._writer = threading.Thread(target=self._write_frames, daemon=True)
+                self._writer.start()
                 self.initialized = True
-                logging.info("LED strip initialized successfully")
+                self.logger.info("LED strip initialized successfully")
                 
                 # Turn off all LEDs initially
                 self.clear()
             except Exception as e:
-                logging.error(f"Error initializing LED strip: {e}")
+                self.logger.error("Error initializing LED strip: %s", e)
                 self.initialized = False
     
     def update_brightness(self):
-        """Update LED brightness based on light sensor"""
+        """Update LED brightness based on light sensor
+        
+        The new brightness is applied to the strip on the next commit().
+        """
         if not self.light_sensor or not self.initialized:
             return
             
-        current_time = time.time()
-        update_interval = self.config.get("light_sensor_update_interval", DEFAULT_LIGHT_SENSOR_UPDATE_INTERVAL)
+        now = time.monotonic()
         
         # Only update brightness periodically
-        if current_time - self.last_brightness_update < update_interval:
+        if now < self._next_brightness_deadline:
             return
-            
-        min_brightness = self.config.get("min_brightness", DEFAULT_MIN_BRIGHTNESS)
-        max_brightness = self.config.get("max_brightness", DEFAULT_MAX_BRIGHTNESS)
         
-        new_brightness = self.light_sensor.get_auto_brightness(min_brightness, max_brightness)
+        new_brightness = self.light_sensor.get_auto_brightness(self._min_b, self._max_b)
         
         if new_brightness != self.current_brightness:
             self.current_brightness = new_brightness
-            self.strip.setBrightness(new_brightness)
-            self.strip.show()
-            logging.info(f"LED brightness adjusted to {new_brightness}%")
+            self.logger.info("LED brightness adjusted to %d%%", new_brightness)
             print(f"Light sensor: LED brightness adjusted to {new_brightness}%")
             
-        self.last_brightness_update = current_time
+        self._next_brightness_deadline = now + self._update_interval
     
     def set_led(self, index, color_name):
-        """Set an LED to a specific color"""
-        if not self.initialized or index >= self.config["led_count"]:
-            logging.warning(f"LED index {index} out of range or LED strip not initialized.")
+        """Set an LED to a specific color
+        
+        The change is buffered; call commit() to push it to the strip.
+        """
+        if not self.initialized or index >= self._led_count:
+            self.logger.warning("LED index %d out of range or LED strip not initialized.", index)
             return
             
-        # Update brightness before setting LED
-        self.update_brightness()
+        color = LED_COLORS.get(color_name)
+        if color is None:
+            self.logger.warning("Unknown color name: %s. Using default OFF color.", color_name)
+            color = LED_COLORS["OFF"]
+        self._frame[index] = color
+    
+    def set_leds(self, assignments):
+        """Set many LEDs in one call
+        
+        Same as calling set_led() for each pair, with the per-call checks and
+        lookups hoisted out of the loop. Changes are buffered until commit().
+        
+        Args:
+            assignments: Iterable of (index, color_name) pairs
+        """
+        if not self.initialized:
+            self.logger.warning("LED strip not initialized.")
+            return
+        
+        colors = LED_COLORS
+        off = colors["OFF"]
+        frame = self._frame
+        led_count = self._led_count
+        for index, color_name in assignments:
+            if index >= led_count:
+                self.logger.warning("LED index %d out of range.", index)
+                continue
+            color = colors.get(color_name)
+            if color is None:
+                self.logger.warning("Unknown color name: %s. Using default OFF color.", color_name)
+                color = off
+            frame[index] = color
+    
+    def commit(self):
+        """Hand the buffered frame and current brightness to the LED writer thread
+        
+        Returns immediately; the writer shows only the most recent frame, so
+        frames committed faster than the strip can show them are dropped.
+        """
+        if not self.initialized:
+            return
             
-        if color_name in LED_COLORS:
-            color = LED_COLORS[color_name]
-            self.strip.setPixelColor(index, color)
-            self.strip.show()
-        else:
-            logging.warning(f"Unknown color name: {color_name}. Using default OFF color.")
-            self.strip.setPixelColor(index, LED_COLORS["OFF"])
-            self.strip.show()
+        self.update_brightness()
+        self._submit((tuple(self._frame), self.current_brightness))
+    
+    def _submit(self, item):
+        """Replace any pending frame with a new one"""
+        try:
+            self._frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        # Only this thread puts, so the slot is free after the drain above
+        self._frame_queue.put_nowait(item)
+    
+    def _write_frames(self):
+        """Copy committed frames to the strip and show them (runs on the writer thread)"""
+        pixels = self.strip.getPixels()
+        shown = [None] * self._led_count
+        shown_brightness = None
+        while True:
+            item = self._frame_queue.get()
+            if item is None:
+                return
+            frame, brightness = item
+            try:
+                if brightness != shown_brightness:
+                    self.strip.setBrightness(brightness)
+                    shown_brightness = brightness
+                # Only pixels that differ from the last shown frame are written
+                for i, color in enumerate(frame):
+                    if shown[i] != color:
+                        pixels[i] = color
+                        shown[i] = color
+                self.strip.show()
+            except Exception as e:
+                self.logger.error("Error writing LED frame: %s", e)
     
     def clear(self):
         """Turn off all LEDs"""
         if not self.initialized:
             return
             
-        for i in range(self.config["led_count"]):
-            self.strip.setPixelColor(i, LED_COLORS["OFF"])
-        self.strip.show()
+        self._frame[:] = [LED_COLORS["OFF"]] * self._led_count
+        self.commit()
+    
+    def close(self):
+        """Show any pending frame and stop the LED writer thread"""
+        if self._writer is None:
+            return
+        
+        # Waits for the writer to take the pending frame, so it is still shown
+        try:
+            self._frame_queue.put(None, timeout=1.0)
+        except queue.Full:
+            self.logger.warning("LED writer did not take the last frame before shutdown")
+        self._writer.join(timeout=1.0)
+        self._writer = None
 
 class METARStatus:
     """Main METAR Status class - now simplified using manager classes"""
@@ -196,9 +320,12 @@ class METARStatus:
         self.display_manager = DisplayManager(config, led_controller)
         self.mode_manager = ModeManager(config, led_controller)
         
+        self.led_controller = led_controller
+        
         # Set up legend LEDs if we have an LED controller
         if led_controller:
             self.mode_manager._set_legend_leds()
+            led_controller.commit()
         
         self.logger.info("Initialized METAR Status with manager classes")
     
@@ -210,12 +337,7 @@ class METARStatus:
         
         # Print status message
         print("\n" + DISPLAY_FORMATTING["HEADER_LINE"])
-        if self.mode_manager.display_mode == DisplayMode.METAR:
-            print(f"Display mode changed to: {DisplayMode.get_name(self.mode_manager.display_mode)}")
-        elif self.mode_manager.display_mode == DisplayMode.TAF:
-            print(f"Display mode changed to: {DisplayMode.get_name(self.mode_manager.display_mode, self.mode_manager.current_forecast_hour)}")
-        else:
-            print(f"Display mode changed to: {DisplayMode.get_name(self.mode_manager.display_mode)}")
+        print(f"Display mode changed to: {DisplayMode.get_name(mode, self.mode_manager.current_forecast_hour)}")
         print(DISPLAY_FORMATTING["HEADER_LINE"])
         
         return mode
@@ -240,11 +362,13 @@ class METARStatus:
             self.mode_manager.current_forecast_hour
         )
     
-    def fetch_metar_data(self):
-        """Fetch and process METAR data using data manager"""
-        # Print legends and headers
+    def print_static_header(self):
+        """Print the color legend and LED mapping, which only change with the config"""
         self.print_color_legend()
         self.print_led_mapping()
+    
+    def fetch_metar_data(self):
+        """Fetch and process METAR data using data manager"""
         print("\nFetching METAR data for airports...")
         print(DISPLAY_FORMATTING["HEADER_LINE"])
         
@@ -257,6 +381,10 @@ class METARStatus:
         for station_id, airport_data in self.data_manager.airport_data.items():
             self.display_manager.display_airport_data(station_id, airport_data)
         
+        # Push all airport LED changes to the strip at once
+        if self.led_controller:
+            self.led_controller.commit()
+        
         # Print LED summary
         self.print_led_summary()
         
@@ -288,11 +416,22 @@ def main():
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    
+    # Write the log file from a background thread so file I/O never blocks the refresh loop
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, file_handler)
+    log_listener.start()
+    # Flush queued records on every exit path, including sys.exit() in load_config
+    atexit.register(log_listener.stop)
+    root_logger.addHandler(QueueHandler(log_queue))
     
     # Get application logger
     logger = logging.getLogger("metar_monitor")
     logger.info("Starting METAR Monitor with log rotation (7 days retention)")
+    if LED_ENABLED:
+        logger.info("LED support enabled")
+    else:
+        logger.info("rpi_ws281x library not found. Running in console-only mode.")
     
     # Try to import ButtonHandler
     try:
@@ -322,7 +461,7 @@ def main():
         else:
             logger.info("Light sensor not available, using fixed brightness")
     except Exception as e:
-        logger.warning(f"Failed to initialize light sensor: {e}")
+        logger.warning("Failed to initialize light sensor: %s", e)
     
     # Initialize LED controller if possible
     led_controller = None
@@ -335,21 +474,50 @@ def main():
     # Initialize METAR status with LED controller
     metar_status = METARStatus(config, led_controller)
     
+    # Button and keyboard threads only post events here; the main loop handles
+    # them, so mode changes never race a data update or drive the strip concurrently
+    event_queue = queue.SimpleQueue()
+    # Set to wake the main loop early: for a queued event or for shutdown
+    wake_event = threading.Event()
+    shutdown_event = threading.Event()
+    refresh_on_toggle = config.get("refresh_on_toggle", DEFAULT_REFRESH_ON_TOGGLE)
+    
+    def request_shutdown(signum, frame):
+        logger.info("Signal %d received, shutting down", signum)
+        shutdown_event.set()
+        wake_event.set()
+    
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+    
+    def post_event(source):
+        event_queue.put(("mode_toggle", source))
+        wake_event.set()
+    
+    def handle_events():
+        """Run queued mode toggles on the main thread; returns how many ran"""
+        handled = 0
+        while True:
+            try:
+                event, source = event_queue.get_nowait()
+            except queue.Empty:
+                return handled
+            if event == "mode_toggle":
+                mode = metar_status.toggle_display_mode()
+                logger.info("%s pressed: Display mode toggled to %s", source,
+                            DisplayMode.get_name(mode, metar_status.mode_manager.current_forecast_hour))
+                # Print LED status summary when switching modes
+                metar_status.print_led_summary()
+                handled += 1
+    
     # Set up button handler if available
     button_handler = None
     if button_available:
-        # Configure the button handler with the toggle display mode callback
+        # Configure the button handler to post mode toggle events
         button_pin = config.get("button_pin", DEFAULT_BUTTON_PIN)
         logger.info("Setting up button handler on GPIO pin %d", button_pin)
         
-        def toggle_mode_callback():
-            mode = metar_status.toggle_display_mode()
-            logger.info("Button pressed: Display mode toggled to %s", 
-                       DisplayMode.get_name(mode))
-            # Print LED status summary when switching modes
-            metar_status.print_led_summary()
-        
-        button_handler = ButtonHandler(button_pin, toggle_mode_callback)
+        button_handler = ButtonHandler(button_pin, lambda: post_event("Button"))
         button_success = button_handler.start()
         
         if button_success:
@@ -363,19 +531,19 @@ def main():
     if not button_handler or not button_success:
         logger.info("Setting up keyboard handler for mode switching")
         
-        def keyboard_toggle_callback():
-            mode = metar_status.toggle_display_mode()
-            logger.info("Key pressed: Display mode toggled to %s", 
-                       DisplayMode.get_name(mode))
-            # Print LED status summary when switching modes
-            metar_status.print_led_summary()
-        
-        keyboard_handler = KeyboardHandler(keyboard_toggle_callback)
+        keyboard_handler = KeyboardHandler(lambda: post_event("Key"))
         keyboard_handler.start()
         logger.info("Keyboard handler started successfully")
         print("Press 'm' key to toggle between display modes.")
     
+    # Anchor refreshes to a monotonic schedule so fetch time does not accumulate as drift
+    interval = config['update_interval']
+    next_tick = time.monotonic() + interval
+    
     try:
+        # The legend and LED mapping are static, so print them once at startup
+        metar_status.print_static_header()
+        
         # Initial data fetch
         if metar_status.fetch_metar_data():
             print("\nCompleted fetching all airport data.")
@@ -383,22 +551,30 @@ def main():
             # Update LED display based on initial mode
             metar_status.update_led_display()
         
-        while True:
+        while not shutdown_event.is_set():
             # Wait for the configured update interval
             print(f"\nNext update in {config['update_interval'] // 60} minutes. Press Ctrl+C to exit.")
-            if metar_status.mode_manager.display_mode == DisplayMode.METAR:
-                print(f"Current display mode: {DisplayMode.get_name(metar_status.mode_manager.display_mode)}")
-            elif metar_status.mode_manager.display_mode == DisplayMode.TAF:
-                print(f"Current display mode: {DisplayMode.get_name(metar_status.mode_manager.display_mode, metar_status.mode_manager.current_forecast_hour)}")
-            else:
-                print(f"Current display mode: {DisplayMode.get_name(metar_status.mode_manager.display_mode)}")
+            mode_manager = metar_status.mode_manager
+            print(f"Current display mode: {DisplayMode.get_name(mode_manager.display_mode, mode_manager.current_forecast_hour)}")
             
             if button_handler and button_success:
                 print("Press button to toggle between METAR, TAF, Airports Visited, and Test display modes.")
             elif keyboard_handler:
                 print("Press 'm' key to toggle between METAR, TAF, Airports Visited, and Test display modes.")
                 
-            time.sleep(config['update_interval'])
+            # Sleep until the next tick, handling mode toggles as they arrive
+            refresh_now = False
+            while not shutdown_event.is_set() and not refresh_now and time.monotonic() < next_tick:
+                wake_event.wait(timeout=max(0.0, next_tick - time.monotonic()))
+                wake_event.clear()
+                if handle_events() and refresh_on_toggle:
+                    refresh_now = True
+            if shutdown_event.is_set():
+                break
+            if refresh_now:
+                # An on-demand refresh restarts the schedule from now
+                next_tick = time.monotonic()
+            next_tick += interval
             
             # Fetch updated data
             if metar_status.fetch_metar_data():
@@ -406,10 +582,15 @@ def main():
                 
                 # Update LED display based on current mode
                 metar_status.update_led_display()
+            
+            # An overrun leaves no time to sleep, so the next update starts immediately
+            overrun = time.monotonic() - next_tick
+            if overrun > 0:
+                logger.warning("Data update overran the update interval by %.1f seconds", overrun)
     
     #except KeyboardInterrupt:
     finally:
-        logger.info("KeyboardInterrupt received, shutting down")
+        logger.info("Shutting down")
         # Clean up resources
         if button_handler:
             button_handler.stop()
@@ -421,6 +602,7 @@ def main():
             
         if led_controller:
             led_controller.clear()
+            led_controller.close()
             logger.info("LED controller cleared")
             
         if light_sensor:
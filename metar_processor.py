@@ -4,6 +4,7 @@ METAR data processing module for METAR Monitor
 Handles parsing and analysis of METAR data
 """
 
+import re
 import logging
 from typing import Dict, Any, Optional, Tuple
 
@@ -11,6 +12,58 @@ from constants import THRESHOLDS
 
 logger = logging.getLogger(__name__)
 
+# Category thresholds bound once at import for the classifier hot path
+_LIFR_VIS = THRESHOLDS["VISIBILITY"]["LIFR"]
+_LIFR_CEILING = THRESHOLDS["CEILING"]["LIFR"]
+_IFR_VIS = THRESHOLDS["VISIBILITY"]["IFR"]
+_IFR_CEILING = THRESHOLDS["CEILING"]["IFR"]
+_MVFR_VIS = THRESHOLDS["VISIBILITY"]["MVFR"]
+_MVFR_CEILING = THRESHOLDS["CEILING"]["MVFR"]
+
+_INF = float("inf")
+
+# Plain decimal numbers, checked before float() so bad input avoids exception handling
+_NUMERIC_RE = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)\s*")
+
+
+def _parse_visibility(visibility: Any) -> Optional[float]:
+    """Convert a METAR visibility value to statute miles
+    
+    Args:
+        visibility: Visibility from the API (number, numeric string, or "10+")
+        
+    Returns:
+        float: Visibility in statute miles, or None if it cannot be parsed
+    """
+    value_type = type(visibility)
+    if value_type is float:
+        return visibility
+    if value_type is int:
+        return float(visibility)
+    if value_type is str:
+        if visibility == "10+":
+            return 10.0
+        if _NUMERIC_RE.fullmatch(visibility):
+            return float(visibility)
+    return None
+
+
+def _parse_cloud_base(base: Any) -> Optional[int]:
+    """Convert a cloud layer base to an integer height in feet
+    
+    Args:
+        base: Cloud base from the API (usually already an int)
+        
+    Returns:
+        int: Cloud base in feet, or None if it cannot be parsed
+    """
+    if type(base) is int:
+        return base
+    try:
+        return int(base)
+    except (ValueError, TypeError):
+        return None
+
 
 def determine_flight_category_from_values(visibility: Optional[float], ceiling: Optional[int]) -> str:
     """Determine flight category based on visibility and ceiling values
@@ -25,22 +78,22 @@ def determine_flight_category_from_values(visibility: Optional[float], ceiling:
     if visibility is None and ceiling is None:
         return "Unknown"
     
+    # A missing value never lowers the category, so treat it as unlimited
+    if visibility is None:
+        visibility = _INF
+    if ceiling is None:
+        ceiling = _INF
+    
     # Check for LIFR conditions first (lowest ceiling/visibility)
-    lifr_vis = THRESHOLDS["VISIBILITY"]["LIFR"]
-    lifr_ceiling = THRESHOLDS["CEILING"]["LIFR"]
-    if (visibility is not None and visibility < lifr_vis) or (ceiling is not None and ceiling < lifr_ceiling):
+    if visibility < _LIFR_VIS or ceiling < _LIFR_CEILING:
         return "LIFR"  # Low IFR
     
     # Check for IFR conditions
-    ifr_vis = THRESHOLDS["VISIBILITY"]["IFR"]
-    ifr_ceiling = THRESHOLDS["CEILING"]["IFR"]
-    if (visibility is not None and visibility < ifr_vis) or (ceiling is not None and ceiling < ifr_ceiling):
+    if visibility < _IFR_VIS or ceiling < _IFR_CEILING:
         return "IFR"   # IFR
     
     # Check for MVFR conditions
-    mvfr_vis = THRESHOLDS["VISIBILITY"]["MVFR"]
-    mvfr_ceiling = THRESHOLDS["CEILING"]["MVFR"]
-    if (visibility is not None and visibility < mvfr_vis) or (ceiling is not None and ceiling < mvfr_ceiling):
+    if visibility < _MVFR_VIS or ceiling < _MVFR_CEILING:
         return "MVFR"  # Marginal VFR
     
     # If none of the above, it's VFR
@@ -57,29 +110,24 @@ def determine_flight_category(metar: Dict[str, Any]) -> str:
         str: Flight category (VFR, MVFR, IFR, LIFR, or Unknown)
     """
     # Extract visibility (in statute miles)
-    visibility = metar.get("visib")
-    if visibility == "10+":
-        visibility = 10.0
-    else:
-        try:
-            visibility = float(visibility)
-        except (ValueError, TypeError):
-            visibility = None
+    visibility = _parse_visibility(metar.get("visib"))
     
     # Find lowest ceiling (height of lowest broken or overcast layer)
     ceiling = None
     clouds = metar.get("clouds", [])
     for cloud in clouds:
         cover = cloud.get("cover")
-        if cover in ["BKN", "OVC"]:  # Broken or Overcast
+        if cover in ("BKN", "OVC"):  # Broken or Overcast
             base = cloud.get("base")
             if base is not None:
-                try:
-                    base = int(base)
-                    if ceiling is None or base < ceiling:
-                        ceiling = base
-                except (ValueError, TypeError):
-                    pass
+                base = _parse_cloud_base(base)
+                if base is None:
+                    continue
+                # A ceiling below the LIFR threshold decides the category on its own
+                if base < _LIFR_CEILING:
+                    return "LIFR"
+                if ceiling is None or base < ceiling:
+                    ceiling = base
     
     # Use helper method to determine flight category
     return determine_flight_category_from_values(visibility, ceiling)
@@ -108,6 +156,6 @@ def process_metar_data(station_id: str, metar_data: Dict[str, Any], airport_name
         "name": airport_name
     }
     
-    logger.info("Processed METAR for %s - %s: %s", station_id, airport_name, flight_category)
+    logger.debug("Processed METAR for %s - %s: %s", station_id, airport_name, flight_category)
     
     return processed_data
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Response cache module for METAR Monitor
+Keeps the last API responses on disk and serves them stale-while-revalidate
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """On-disk TTL cache for batched API responses
+
+    Entries younger than the TTL are returned as is. Entries within the stale
+    window past the TTL are returned immediately while a background thread
+    fetches a fresh copy. Older (or missing) entries are fetched synchronously.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float, stale_window: float):
+        """Initialize the response cache
+
+        Args:
+            cache_dir: Directory holding the cache files
+            ttl: Seconds a cached response is considered fresh
+            stale_window: Seconds past the TTL a response may still be served
+                while it is refreshed in the background
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.ttl = ttl
+        self.stale_window = stale_window
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str, ids: List[str]) -> Optional[tuple]:
+        """Load a cached response and its age, or None if unusable
+
+        Args:
+            key: Cache entry name (e.g. "metar")
+            ids: Airport identifiers the response must cover
+
+        Returns:
+            tuple: (data, age in seconds), or None on a miss
+        """
+        path = self._path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache file %s: %s", path, e)
+            return None
+
+        # A response fetched for a different airport list is a miss
+        if not isinstance(entry, dict) or entry.get("ids") != ids:
+            return None
+        return entry.get("data"), age
+
+    def _store(self, key: str, ids: List[str], data: Any) -> None:
+        """Write a response to disk atomically"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"ids": ids, "data": data}, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write cache file for %s: %s", key, e)
+
+    def _refresh(self, key: str, ids: List[str], fetch: Callable[[], Any]) -> None:
+        """Fetch and store a fresh response; runs on a background thread"""
+        try:
+            self._store(key, ids, fetch())
+            logger.debug("Background refresh of %s cache complete", key)
+        except Exception as e:
+            logger.warning("Background refresh of %s cache failed: %s", key, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: str, ids: List[str], fetch: Callable[[], Any]) -> Any:
+        """Return the response for a key, fetching it if needed
+
+        Args:
+            key: Cache entry name (e.g. "metar")
+            ids: Airport identifiers the response covers
+            fetch: Callable performing the API request
+
+        Returns:
+            The cached or freshly fetched response
+
+        Raises:
+            Any exception raised by fetch when a synchronous fetch is needed
+        """
+        cached = self._load(key, ids)
+        if cached is not None:
+            data, age = cached
+            if age < self.ttl:
+                logger.debug("Using cached %s response (%.0f seconds old)", key, age)
+                return data
+            if age < self.ttl + self.stale_window:
+                logger.debug("Using stale %s response (%.0f seconds old), refreshing", key, age)
+                with self._lock:
+                    start = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start:
+                    threading.Thread(target=self._refresh, args=(key, ids, fetch), daemon=True).start()
+                return data
+
+        data = fetch()
+        self._store(key, ids, data)
+        return data
@@ -5,8 +5,11 @@ Handles parsing and analysis of TAF (forecast) data
 """
 
 import re
+import time
 import logging
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from bisect import bisect_left
+from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 from constants import THRESHOLDS
@@ -14,6 +17,30 @@ from metar_processor import determine_flight_category_from_values
 
 logger = logging.getLogger(__name__)
 
+# Placeholders for missing wind direction and speed in forecast summaries
+_MISSING_WDIR = "---"
+_MISSING_WSPD = "--"
+
+# Cloud covers that form a ceiling, and the ceiling below which a period is LIFR
+_CEILING_COVERS = ("BKN", "OVC")
+_LIFR_CEILING = THRESHOLDS["CEILING"]["LIFR"]
+
+# Keys of a forecast slot as filled by process_forecast_period
+FORECAST_SLOT_KEYS = ("category", "color", "taf_summary", "time_from", "time_to", "raw_data")
+
+# Visibility strings that are not plain numbers
+_VISIBILITY_VALUES = {"6+": 6.0, "P6SM": 6.0}
+
+# Plain decimal numbers, checked before float() so bad input avoids exception handling
+_NUMERIC_RE = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)\s*")
+
+# Bound once so converting period times skips the attribute lookup on datetime
+_fromtimestamp = datetime.fromtimestamp
+
+# Parsed period indexes keyed by (airport, raw TAF), least recently used first
+_PERIOD_INDEX_CACHE_SIZE = 512
+_period_index_cache = OrderedDict()
+
 
 def get_most_recent_taf(taf_data_list: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Extract the most recent TAF from a list of TAFs
@@ -26,58 +53,160 @@ def get_most_recent_taf(taf_data_list: List[Dict[str, Any]]) -> Optional[Dict[st
     """
     if not taf_data_list:
         return None
+    
+    # A single TAF is the most recent whatever its flag says
+    if len(taf_data_list) == 1:
+        return taf_data_list[0]
         
-    # First look for the TAF with mostRecent=1 flag
-    for taf in taf_data_list:
-        if taf.get("mostRecent") == 1:
-            return taf
-            
-    # If no mostRecent flag found, fall back to first TAF
-    return taf_data_list[0]
+    # Look for the TAF with mostRecent=1 flag, falling back to the first TAF
+    return next((taf for taf in taf_data_list if taf.get("mostRecent") == 1), taf_data_list[0])
 
 
-def find_relevant_forecast_period(forecast_periods: List[Dict[str, Any]], target_time: datetime) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
-    """Find the forecast period that covers the target time
+def parse_forecast_periods(forecast_periods: List[Dict[str, Any]]) -> List[Tuple[int, int, Dict[str, Any]]]:
+    """Convert the forecast period times of a TAF to epoch integers once
+    
+    This is the only place period times are coerced; everything downstream
+    works on the returned ints. The JSON API already sends them as ints, so
+    the conversion is skipped for those.
     
     Args:
         forecast_periods: List of forecast period objects from the TAF data
-        target_time: The target time to find a forecast for
         
     Returns:
-        tuple: (period, from_time) - The matching forecast period and its start time,
-              or (None, None) if no matching period is found
+        list: (time_from, time_to, period) tuples for every period with valid times
     """
-    if not forecast_periods:
-        return None, None
-        
+    periods_epoch = []
     for period in forecast_periods:
         time_from = period.get("timeFrom")
         time_to = period.get("timeTo")
         
-        if not time_from or not time_to:
+        if type(time_from) is int and type(time_to) is int:
+            periods_epoch.append((time_from, time_to, period))
+            continue
+        
+        if time_from is None or time_to is None:
             continue
             
-        # Convert epoch times to datetime objects - with type checking
         try:
-            # Ensure timestamps are integers
-            time_from_int = int(time_from)
-            time_to_int = int(time_to)
-            
-            # Convert to datetime objects
-            from_time = datetime.fromtimestamp(time_from_int)
-            to_time = datetime.fromtimestamp(time_to_int)
-            
-            # Check if target time is within this period
-            if from_time <= target_time <= to_time:
-                # Return both the period and the from_time for display
-                return period, from_time
-            
+            periods_epoch.append((int(time_from), int(time_to), period))
         except (TypeError, ValueError) as e:
             # Log the error but continue processing other periods
-            logger.warning("Invalid timestamp in forecast period: %s", str(e))
-            continue
+            logger.warning("Invalid timestamp in forecast period: %s", e)
+    
+    return periods_epoch
+
+
+def period_end_index(periods_epoch: List[Tuple[int, int, Dict[str, Any]]]) -> Optional[List[int]]:
+    """Build a bisectable list of period end times, if the periods allow it
+    
+    TEMPO/PROB/BECMG groups overlap the FM periods they modify, so binary
+    search is only used when the periods are in order and do not overlap.
+    
+    Args:
+        periods_epoch: Periods as returned by parse_forecast_periods()
+        
+    Returns:
+        list: End times of the periods, or None if the periods overlap or are unordered
+    """
+    prev_to = None
+    for time_from, time_to, _ in periods_epoch:
+        if time_from > time_to or (prev_to is not None and time_from < prev_to):
+            return None
+        prev_to = time_to
+    return [time_to for _, time_to, _ in periods_epoch]
+
+
+def get_period_index(airport: str, raw_taf: Optional[str], forecast_periods: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, int, Dict[str, Any]]], Optional[List[int]]]:
+    """Parse and index the forecast periods of a TAF, reusing earlier results
+    
+    TAFs are issued every few hours but polled far more often, so the parsed
+    periods are cached by raw TAF text and only rebuilt when the TAF changes.
+    
+    Args:
+        airport: The ICAO identifier of the airport
+        raw_taf: The raw TAF text; the cache is bypassed when it is missing
+        forecast_periods: List of forecast period objects from the TAF data
+        
+    Returns:
+        tuple: (periods_epoch, period_ends) as returned by parse_forecast_periods()
+               and period_end_index()
+    """
+    if raw_taf is None:
+        periods_epoch = parse_forecast_periods(forecast_periods)
+        return periods_epoch, period_end_index(periods_epoch)
+    
+    key = (airport, raw_taf)
+    index = _period_index_cache.get(key)
+    if index is not None:
+        _period_index_cache.move_to_end(key)
+        return index
+    
+    periods_epoch = parse_forecast_periods(forecast_periods)
+    index = (periods_epoch, period_end_index(periods_epoch))
+    _period_index_cache[key] = index
+    if len(_period_index_cache) > _PERIOD_INDEX_CACHE_SIZE:
+        _period_index_cache.popitem(last=False)
+    return index
+
+
+def _find_period_epoch(periods_epoch: List[Tuple[int, int, Dict[str, Any]]], target_ts: float, period_ends: Optional[List[int]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[int], Optional[int]]:
+    """Find the forecast period covering an epoch time, keeping its times as ints
+    
+    Returns:
+        tuple: (period, time_from, time_to) for the first matching period,
+              or (None, None, None) if no matching period is found
+    """
+    if period_ends is not None:
+        # First period ending at or after the target; later ones start after it ends
+        index = bisect_left(period_ends, target_ts)
+        if index < len(periods_epoch) and periods_epoch[index][0] <= target_ts:
+            time_from, time_to, period = periods_epoch[index]
+            return period, time_from, time_to
+        return None, None, None
+    
+    for time_from, time_to, period in periods_epoch:
+        if time_from <= target_ts <= time_to:
+            return period, time_from, time_to
             
-    return None, None
+    return None, None, None
+
+
+def find_forecast_period_at(periods_epoch: List[Tuple[int, int, Dict[str, Any]]], target_ts: float, period_ends: Optional[List[int]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[datetime], Optional[datetime]]:
+    """Find the forecast period covering an epoch time
+    
+    Args:
+        periods_epoch: Periods as returned by parse_forecast_periods()
+        target_ts: The target time as a Unix timestamp
+        period_ends: Optional result of period_end_index(); when given, the
+                     period is found by binary search instead of a scan
+        
+    Returns:
+        tuple: (period, from_time, to_time) - The first matching forecast period and
+              its start and end times, or (None, None, None) if no matching period is found
+    """
+    period, time_from, time_to = _find_period_epoch(periods_epoch, target_ts, period_ends)
+    if period is None:
+        return None, None, None
+    # Only the matching period's times are converted to datetimes
+    return period, _fromtimestamp(time_from), _fromtimestamp(time_to)
+
+
+def find_relevant_forecast_period(forecast_periods: List[Dict[str, Any]], target_time: datetime) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
+    """Find the forecast period that covers the target time
+    
+    Args:
+        forecast_periods: List of forecast period objects from the TAF data
+        target_time: The target time to find a forecast for
+        
+    Returns:
+        tuple: (period, from_time) - The matching forecast period and its start time,
+              or (None, None) if no matching period is found
+    """
+    if not forecast_periods:
+        return None, None
+        
+    period, from_time, _ = find_forecast_period_at(parse_forecast_periods(forecast_periods), target_time.timestamp())
+    return period, from_time
 
 
 def format_clouds_info(clouds: Optional[List[Dict[str, Any]]]) -> str:
@@ -91,15 +220,10 @@ def format_clouds_info(clouds: Optional[List[Dict[str, Any]]]) -> str:
     """
     if not clouds:
         return ""
-        
-    clouds_info = []
-    for cloud in clouds:
-        cover = cloud.get("cover", "")
-        base = cloud.get("base", "")
-        if cover and base:
-            clouds_info.append(f"{cover}{base}")
-        
-    return " ".join(clouds_info)
+    
+    # str.join builds a list from a generator anyway, so a comprehension is the cheaper form
+    return " ".join([f"{cloud['cover']}{cloud['base']}" for cloud in clouds
+                     if cloud.get("cover") and cloud.get("base")])
 
 
 def format_wind(wdir: Optional[Union[str, int]], wspd: Optional[Union[str, int]]) -> str:
@@ -112,14 +236,40 @@ def format_wind(wdir: Optional[Union[str, int]], wspd: Optional[Union[str, int]]
     Returns:
         str: Formatted wind string (e.g., "27015")
     """
+    # Fast path: the API normally sends both values as integers
+    if type(wdir) is int and type(wspd) is int:
+        return "%03d%02d" % (wdir, wspd)
+    
     try:
         # Try to format as integers with padding
-        wdir_fmt = f"{int(wdir):03d}" if wdir is not None else "---"
-        wspd_fmt = f"{int(wspd):02d}" if wspd is not None else "--"
-        return f"{wdir_fmt}{wspd_fmt}"
+        wdir_fmt = "%03d" % int(wdir) if wdir is not None else _MISSING_WDIR
+        wspd_fmt = "%02d" % int(wspd) if wspd is not None else _MISSING_WSPD
+        return wdir_fmt + wspd_fmt
     except (ValueError, TypeError):
         # If conversion fails, just concatenate the raw values
-        return f"{wdir or '---'}{wspd or '--'}"
+        return f"{wdir or _MISSING_WDIR}{wspd or _MISSING_WSPD}"
+
+
+def _parse_forecast_visibility(visibility: Any) -> Optional[float]:
+    """Convert a TAF visibility value to statute miles
+    
+    Args:
+        visibility: Visibility from the API (number, numeric string, "6+" or "P6SM")
+        
+    Returns:
+        float: Visibility in statute miles, or None if it cannot be parsed
+    """
+    value_type = type(visibility)
+    if value_type is str:
+        known = _VISIBILITY_VALUES.get(visibility)
+        if known is not None:
+            return known
+        return float(visibility) if _NUMERIC_RE.fullmatch(visibility) else None
+    if value_type is float:
+        return visibility
+    if isinstance(visibility, int):
+        return float(visibility)
+    return None
 
 
 def determine_forecast_category(forecast_period: Dict[str, Any]) -> str:
@@ -132,48 +282,92 @@ def determine_forecast_category(forecast_period: Dict[str, Any]) -> str:
         str: Flight category (VFR, MVFR, IFR, LIFR, or Unknown)
     """
     # Extract visibility (in statute miles)
-    visibility = forecast_period.get("visib")
-    if visibility == "6+" or visibility == "P6SM":
-        visibility = 6.0
-    else:
-        try:
-            visibility = float(visibility)
-        except (ValueError, TypeError):
-            visibility = None
+    visibility = _parse_forecast_visibility(forecast_period.get("visib"))
     
     # Find lowest ceiling (height of lowest broken or overcast layer)
     ceiling = None
     clouds = forecast_period.get("clouds", [])
     for cloud in clouds:
-        cover = cloud.get("cover")
-        if cover in ["BKN", "OVC"]:  # Broken or Overcast
+        if cloud.get("cover") in _CEILING_COVERS:  # Broken or Overcast
             base = cloud.get("base")
-            if base is not None:
+            if base is None:
+                continue
+            if type(base) is not int:
                 try:
                     base = int(base)
-                    if ceiling is None or base < ceiling:
-                        ceiling = base
                 except (ValueError, TypeError):
-                    pass
+                    continue
+            # A ceiling below the LIFR threshold decides the category on its own
+            if base < _LIFR_CEILING:
+                return "LIFR"
+            if ceiling is None or base < ceiling:
+                ceiling = base
     
     # Use helper method to determine flight category
     return determine_flight_category_from_values(visibility, ceiling)
 
 
-def process_forecast_period(period: Optional[Dict[str, Any]], from_time: Optional[datetime], airport: str, runway_data: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+def _scan_clouds(clouds: Optional[List[Dict[str, Any]]]) -> Tuple[str, Optional[int]]:
+    """Format cloud layers and find the ceiling in a single pass
+    
+    Args:
+        clouds: List of cloud data objects, each containing 'cover' and 'base'
+        
+    Returns:
+        tuple: (clouds_str, ceiling) - the string format_clouds_info() would
+               build and the lowest BKN/OVC base in feet, or None if there is none
+    """
+    if not clouds:
+        return "", None
+    
+    parts = []
+    ceiling = None
+    for cloud in clouds:
+        cover = cloud.get("cover")
+        base = cloud.get("base")
+        if cover and base:
+            parts.append(f"{cover}{base}")
+        if cover in _CEILING_COVERS and base is not None:
+            if type(base) is not int:
+                try:
+                    base = int(base)
+                except (ValueError, TypeError):
+                    continue
+            if ceiling is None or base < ceiling:
+                ceiling = base
+    
+    return " ".join(parts), ceiling
+
+
+def new_forecast_slot() -> Dict[str, Any]:
+    """Create an empty forecast slot for reuse across refreshes
+    
+    Slots stay mutable dictionaries: they are allocated once per airport and
+    forecast hour and refilled in place, and the data manager adds the status
+    color to them after classification.
+    
+    Returns:
+        dict: A forecast dictionary with all keys present and unset
+    """
+    return dict.fromkeys(FORECAST_SLOT_KEYS)
+
+
+def process_forecast_period(period: Optional[Dict[str, Any]], from_time: Optional[datetime], target: Optional[Dict[str, Any]] = None, to_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
     """Process a single forecast period and return its information
     
     Args:
         period: A forecast period object from the TAF data
         from_time: The start time of this forecast period
-        airport: The ICAO identifier of the airport
-        runway_data: Optional runway data for crosswind calculations
+        target: Optional pre-allocated forecast slot to fill in place
+        to_time: The end time of this forecast period, if already converted;
+                 otherwise it is read from the period's timeTo
         
     Returns:
         dict: A dictionary containing formatted forecast information including
-              category, color, summary text, and time range, or None if processing fails
+              category, color, summary text, and time range, or None if processing fails.
+              When target is given, the same dictionary is updated and returned.
     """
-    if not period or not from_time:
+    if period is None or from_time is None:
         return None
         
     # Extract forecast data
@@ -182,33 +376,41 @@ def process_forecast_period(period: Optional[Dict[str, Any]], from_time: Optiona
     wspd = period.get("wspd", "")
     visib = period.get("visib", "")
     
-    # Format from time and clouds
-    from_time_str = from_time.strftime("%d%H%M")
-    clouds_str = format_clouds_info(period.get("clouds", []))
+    # Format from time; the cloud layers are walked once for both the
+    # summary string and the ceiling
+    from_time_str = "%02d%02d%02d" % (from_time.day, from_time.hour, from_time.minute)
+    clouds_str, ceiling = _scan_clouds(period.get("clouds", []))
     
     # Format wind and create summary
     wind_text = format_wind(wdir, wspd)
     taf_summary = f"{fcst_change} {from_time_str} {wind_text}KT {visib} {clouds_str}"
     
-    # Determine flight category
-    forecast_category = determine_forecast_category(period)
+    # Determine flight category, as determine_forecast_category() would
+    forecast_category = determine_flight_category_from_values(_parse_forecast_visibility(period.get("visib")), ceiling)
     
-    return {
-        "category": forecast_category,
-        "taf_summary": taf_summary,
-        "time_from": from_time,
-        "time_to": datetime.fromtimestamp(period.get("timeTo")),
-        "raw_data": period
-    }
+    if target is None:
+        target = new_forecast_slot()
+    
+    target["category"] = forecast_category
+    target["taf_summary"] = taf_summary
+    target["time_from"] = from_time
+    target["time_to"] = to_time if to_time is not None else _fromtimestamp(period.get("timeTo"))
+    target["raw_data"] = period
+    
+    return target
 
 
-def process_taf_data(airport: str, taf_data_list: List[Dict[str, Any]], forecast_hours: List[int]) -> Dict[str, Any]:
+def process_taf_data(airport: str, taf_data_list: List[Dict[str, Any]], forecast_hours: List[int], forecast_slots: Optional[Dict[int, Dict[str, Any]]] = None, now_ts: Optional[float] = None) -> Dict[str, Any]:
     """Process TAF data for a specific airport
     
     Args:
         airport: The ICAO identifier of the airport
         taf_data_list: List of TAF data objects for the airport
         forecast_hours: List of hours ahead to forecast using TAF
+        forecast_slots: Optional pre-allocated forecast slots keyed by hour,
+                        filled in place instead of allocating new dictionaries
+        now_ts: Optional reference time as a Unix timestamp, so one refresh can
+                share a single clock read across airports; defaults to now
         
     Returns:
         dict: Dictionary with forecast information for each requested hour
@@ -219,7 +421,10 @@ def process_taf_data(airport: str, taf_data_list: List[Dict[str, Any]], forecast
     }
     
     try:
-        logger.debug("Processing TAF data for %s", airport)
+        # Checked once so the per-hour debug calls cost nothing when DEBUG is off
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Processing TAF data for %s", airport)
         
         # Get the most recent TAF
         most_recent_taf = get_most_recent_taf(taf_data_list)
@@ -241,25 +446,42 @@ def process_taf_data(airport: str, taf_data_list: List[Dict[str, Any]], forecast
             logger.warning("No forecast periods in TAF for %s", airport)
             return taf_result
             
+        # Parse the period times once for all forecast hours, or reuse them
+        # from an earlier poll of the same TAF
+        periods_epoch, period_ends = get_period_index(airport, raw_taf, forecast_periods)
+        if now_ts is None:
+            now_ts = time.time()
+        
+        # Period times stay ints during the search; each distinct time is
+        # converted to a datetime once, even when periods serve several hours
+        datetimes = {}
+        
         # Process each forecast hour
         processed_hours = 0
         for hours in forecast_hours:
-            # Calculate the target forecast time
-            target_time = datetime.now() + timedelta(hours=hours)
-            
-            # Find the relevant forecast period
-            relevant_period, from_time = find_relevant_forecast_period(
-                forecast_periods, target_time
+            # Find the forecast period covering the target forecast time
+            relevant_period, time_from, time_to = _find_period_epoch(
+                periods_epoch, now_ts + hours * 3600, period_ends
             )
             
             if not relevant_period:
-                logger.debug("No forecast period found for %s at +%d hours", airport, hours)
+                if debug:
+                    logger.debug("No forecast period found for %s at +%d hours", airport, hours)
                 continue
             
+            from_time = datetimes.get(time_from)
+            if from_time is None:
+                from_time = datetimes[time_from] = _fromtimestamp(time_from)
+            to_time = datetimes.get(time_to)
+            if to_time is None:
+                to_time = datetimes[time_to] = _fromtimestamp(time_to)
+            
             # Process the forecast period
-            forecast_data = process_forecast_period(relevant_period, from_time, airport)
+            target = forecast_slots.get(hours) if forecast_slots else None
+            forecast_data = process_forecast_period(relevant_period, from_time, target=target, to_time=to_time)
             if not forecast_data:
-                logger.debug("Failed to process forecast period for %s at +%d hours", airport, hours)
+                if debug:
+                    logger.debug("Failed to process forecast period for %s at +%d hours", airport, hours)
                 continue
                 
             # Store the forecast information
@@ -271,9 +493,10 @@ def process_taf_data(airport: str, taf_data_list: List[Dict[str, Any]], forecast
                 taf_result["forecast_category"] = forecast_data["category"]
                 taf_result["forecast_taf_summary"] = forecast_data["taf_summary"]
         
-        logger.debug("Successfully processed %d forecast periods for %s", processed_hours, airport)
+        if debug:
+            logger.debug("Successfully processed %d forecast periods for %s", processed_hours, airport)
         
     except Exception as e:
-        logger.exception("Error processing TAF data for %s: %s", airport, str(e))
+        logger.exception("Error processing TAF data for %s: %s", airport, e)
         
     return taf_result
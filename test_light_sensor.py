@@ -29,6 +29,8 @@ def main():
     print("-" * 35)
     
     try:
+        # Sample on a fixed 2 second schedule so reading time doesn't add drift
+        deadline = time.monotonic()
         while True:
             # Read light level
             lux = sensor.read_light_level()
@@ -42,7 +44,8 @@ def main():
             else:
                 print("Failed to read sensor")
             
-            time.sleep(2)
+            deadline += 2.0
+            time.sleep(max(0, deadline - time.monotonic()))
             
     except KeyboardInterrupt:
         print("\n\nTest completed!")
@@ -2,3 +2,11 @@
 Test package for METAR Monitor.
 Contains tests for all METAR processing modules.
 """
+
+import os
+import sys
+
+# Make the project modules importable once for every test module
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Shared test fixtures for METAR Monitor
+Read-only configurations reused across the test modules
+"""
+
+from types import MappingProxyType
+
+# Minimal application config for constructing METARStatus; the application
+# only reads its config, so tests pass these mappings directly
+BASE_CONFIG = MappingProxyType({
+    "airports": [
+        {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0},
+        {"icao": "KBFI", "name": "Boeing Field", "led": 1}
+    ],
+    "led_count": 10,
+    "metar_url": "https://aviationweather.gov/api/data/metar",
+    "taf_url": "https://aviationweather.gov/api/data/taf"
+})
+
+# LED strip settings for constructing LEDController
+LED_STRIP_CONFIG = MappingProxyType({
+    "led_count": 10,
+    "led_pin": 18,
+    "led_freq_hz": 800000,
+    "led_dma": 10,
+    "led_invert": False,
+    "led_brightness": 50,
+    "led_channel": 0
+})
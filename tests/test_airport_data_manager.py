@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Airport Data Manager module
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import airport_data_manager
+import taf_processor
+from airport_data_manager import AirportDataManager
+from tests.fixtures import BASE_CONFIG
+
+
+# Reference time for the first refresh in each test
+_START = datetime(2023, 6, 1, 12, 0, 0)
+_START_TS = int(_START.timestamp())
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() returns a time set by the test"""
+
+    current = _START
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def _metar(raw_text, visib, clouds=()):
+    """Build a METAR record as returned by the API client"""
+    return {"rawOb": raw_text, "visib": visib, "clouds": list(clouds)}
+
+
+# METARs for the configured airports, and a changed report for KSEA
+_METARS = {
+    "KSEA": _metar("KSEA 011200Z 26005KT 10SM FEW100", "10+", [{"cover": "FEW", "base": 10000}]),
+    "KBFI": _metar("KBFI 011200Z 26005KT 2SM OVC008", "2", [{"cover": "OVC", "base": 800}])
+}
+_CHANGED_KSEA = _metar("KSEA 011300Z 26005KT 2SM OVC008", "2", [{"cover": "OVC", "base": 800}])
+
+# A TAF for KSEA whose VFR period ends 8 hours after the start, followed by an IFR period
+_TAFS = {
+    "KSEA": [{
+        "rawTAF": "TAF KSEA 011140Z 0112/0212 26005KT P6SM FEW100 FM012000 26005KT 2SM OVC008",
+        "mostRecent": 1,
+        "fcsts": [
+            {"fcstChange": "FM", "timeFrom": _START_TS - 3600, "timeTo": _START_TS + 8 * 3600,
+             "wdir": 260, "wspd": 5, "visib": "6+", "clouds": [{"cover": "FEW", "base": 10000}]},
+            {"fcstChange": "FM", "timeFrom": _START_TS + 8 * 3600, "timeTo": _START_TS + 24 * 3600,
+             "wdir": 260, "wspd": 5, "visib": "2", "clouds": [{"cover": "OVC", "base": 800}]}
+        ]
+    }]
+}
+
+
+class TestAirportDataManagerReuse(unittest.TestCase):
+    """Tests for reusing results of unchanged reports between refreshes"""
+
+    def setUp(self):
+        """Set up a manager whose fetches return the test reports"""
+        _FrozenDatetime.current = _START
+        for patcher in (patch('airport_data_manager.datetime', _FrozenDatetime),
+                        patch.dict(taf_processor._period_index_cache, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.config = {**BASE_CONFIG, "forecast_hours": [6], "cache_ttl": 0}
+        with patch('airport_data_manager.METARAPIClient'):
+            self.manager = AirportDataManager(self.config)
+        self.metars = dict(_METARS)
+        self.manager._fetch_raw_metar_data = lambda airports: self.metars
+        self.manager._fetch_all_taf_data = lambda airports: _TAFS
+
+    def _refresh(self, advance_hours=0):
+        """Run one refresh, advancing the clock first
+
+        Returns:
+            tuple: (METAR classifications, TAF processing runs) during the refresh
+        """
+        _FrozenDatetime.current += timedelta(hours=advance_hours)
+        with patch('airport_data_manager.determine_flight_category',
+                   wraps=airport_data_manager.determine_flight_category) as mock_classify, \
+             patch('airport_data_manager.process_taf_data_module',
+                   wraps=airport_data_manager.process_taf_data_module) as mock_process_taf:
+            self.assertTrue(self.manager.fetch_and_process_data())
+        return mock_classify.call_count, mock_process_taf.call_count
+
+    def test_unchanged_metar_reuses_results(self):
+        """Test that an unchanged METAR keeps its category, wind data and color"""
+        self._refresh()
+        previous = self.manager.airport_data["KBFI"]
+
+        classified, _ = self._refresh()
+
+        self.assertEqual(classified, 0)
+        current = self.manager.airport_data["KBFI"]
+        self.assertEqual(current["flight_category"], "IFR")
+        self.assertEqual(current["status_color"], previous["status_color"])
+        self.assertIs(current["wind_data"], previous["wind_data"])
+
+    def test_changed_metar_is_reclassified(self):
+        """Test that a changed METAR is classified again"""
+        self._refresh()
+        self.assertEqual(self.manager.airport_data["KSEA"]["flight_category"], "VFR")
+
+        self.metars["KSEA"] = _CHANGED_KSEA
+        classified, _ = self._refresh()
+
+        self.assertEqual(classified, 1)
+        self.assertEqual(self.manager.airport_data["KSEA"]["flight_category"], "IFR")
+        self.assertEqual(self.manager.airport_data["KSEA"]["raw_metar"], _CHANGED_KSEA["rawOb"])
+
+    def test_unchanged_taf_reprocessed_when_period_expires(self):
+        """Test that an unchanged TAF is reused until its period stops covering now+N hours"""
+        _, processed = self._refresh()
+        self.assertEqual(processed, 1)
+        self.assertEqual(self.manager.airport_data["KSEA"]["forecasts"][6]["category"], "VFR")
+
+        # +6 hours is still inside the first period an hour later
+        _, processed = self._refresh(advance_hours=1)
+        self.assertEqual(processed, 0)
+        self.assertEqual(self.manager.airport_data["KSEA"]["forecasts"][6]["category"], "VFR")
+
+        # Three hours in, +6 hours falls in the second period
+        _, processed = self._refresh(advance_hours=2)
+        self.assertEqual(processed, 1)
+        self.assertEqual(self.manager.airport_data["KSEA"]["forecasts"][6]["category"], "IFR")
+
+    def test_changed_forecast_hours_forces_reprocessing(self):
+        """Test that changing the forecast hours reprocesses an unchanged TAF"""
+        self._refresh()
+
+        self.config["forecast_hours"] = [6, 12]
+        _, processed = self._refresh()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(sorted(self.manager.airport_data["KSEA"]["forecasts"]), [6, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,37 +4,105 @@ Unit tests for Light Sensor module
 """
 
 import unittest
-import sys
-import os
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, Mock
+
+import light_sensor
+import metar_monitor
+from light_sensor import LightSensor
+from metar_monitor import LEDController
+from tests.fixtures import LED_STRIP_CONFIG
+
+class FakeBus:
+    """Minimal stand-in for smbus2.SMBus that records sensor reads"""
+    __slots__ = ("payload", "error", "reads")
+    
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+        self.reads = 0
+    
+    def write_byte(self, address, value):
+        pass
+    
+    def read_i2c_block_data(self, address, register, length):
+        self.reads += 1
+        if self.error is not None:
+            raise self.error
+        return self.payload
+    
+    def close(self):
+        pass
+
+
+class FakeStrip:
+    """Minimal stand-in for rpi_ws281x.PixelStrip"""
+    __slots__ = ("pixels", "brightness")
+    
+    def __init__(self, led_count):
+        self.pixels = [0] * led_count
+        self.brightness = None
+    
+    def begin(self):
+        pass
+    
+    def getPixels(self):
+        return self.pixels
+    
+    def numPixels(self):
+        return len(self.pixels)
+    
+    def setBrightness(self, brightness):
+        self.brightness = brightness
+    
+    def show(self):
+        pass
+
+
+# Lux the BH1750 conversion gives for a raw reading of 0x04B0 (1200)
+EXPECTED_LUX = ((0x04 << 8) | 0xB0) / 1.2
+
+
+# Hardware library stubs, installed once for the module and reset per test.
+# The modules are imported once, so the stubs replace their library
+# references directly rather than going through sys.modules.
+_mock_smbus = Mock(spec_set=["SMBus"])
+_mock_rpi_ws281x = Mock(spec_set=["PixelStrip"])
+_hardware_patchers = [
+    # The sensor start-up delays only matter on real hardware, so sleep is a no-op
+    patch.multiple(light_sensor, smbus2=_mock_smbus, I2C_AVAILABLE=True,
+                   time=SimpleNamespace(sleep=lambda seconds: None), create=True),
+    patch.multiple(metar_monitor, LED_ENABLED=True, PixelStrip=_mock_rpi_ws281x.PixelStrip, create=True),
+    patch.dict(metar_monitor.LED_COLORS, {"OFF": 0})
+]
+
+
+def setUpModule():
+    """Install the hardware library stubs"""
+    for patcher in _hardware_patchers:
+        patcher.start()
+
+
+def tearDownModule():
+    """Remove the hardware library stubs"""
+    for patcher in reversed(_hardware_patchers):
+        patcher.stop()
 
-# Add the parent directory to the path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 class TestLightSensor(unittest.TestCase):
     """Tests for LightSensor class"""
     
     def setUp(self):
         """Set up test environment"""
-        # Mock smbus2 to avoid hardware dependency
-        self.mock_smbus = MagicMock()
-        self.patcher = patch.dict('sys.modules', {'smbus2': self.mock_smbus})
-        self.patcher.start()
-        
-        # Now import after mocking
-        from light_sensor import LightSensor
-        self.LightSensor = LightSensor
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        self.patcher.stop()
+        # Clear calls and configured behavior left by the previous test
+        _mock_smbus.reset_mock(return_value=True, side_effect=True)
+        self.mock_smbus = _mock_smbus
+        self.bus = FakeBus()
+        self.mock_smbus.SMBus.return_value = self.bus
     
     def test_init_with_i2c_available(self):
         """Test initialization when I2C is available"""
-        mock_bus = MagicMock()
-        self.mock_smbus.SMBus.return_value = mock_bus
-        
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         self.assertTrue(sensor.available)
         self.assertEqual(sensor.address, 0x23)
@@ -44,25 +112,23 @@ class TestLightSensor(unittest.TestCase):
         """Test initialization when I2C is unavailable"""
         self.mock_smbus.SMBus.side_effect = Exception("I2C not available")
         
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         self.assertFalse(sensor.available)
         self.assertIsNone(sensor.bus)
     
     def test_read_light_level_success(self):
         """Test successful light level reading"""
-        mock_bus = MagicMock()
-        mock_bus.read_i2c_block_data.return_value = [0x04, 0xB0]  # 1200 raw value
-        self.mock_smbus.SMBus.return_value = mock_bus
+        self.bus.payload = [0x04, 0xB0]  # 1200 raw value
         
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         lux = sensor.read_light_level()
         
-        self.assertAlmostEqual(lux, 1000.0, places=1)  # 1200 / 1.2 = 1000
+        self.assertEqual(lux, EXPECTED_LUX)  # 1200 / 1.2 = 1000
     
     def test_read_light_level_unavailable(self):
         """Test light level reading when sensor unavailable"""
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         sensor.available = False
         
         lux = sensor.read_light_level()
@@ -71,18 +137,16 @@ class TestLightSensor(unittest.TestCase):
     
     def test_read_light_level_error(self):
         """Test light level reading with I2C error"""
-        mock_bus = MagicMock()
-        mock_bus.read_i2c_block_data.side_effect = Exception("I2C error")
-        self.mock_smbus.SMBus.return_value = mock_bus
+        self.bus.error = Exception("I2C error")
         
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         lux = sensor.read_light_level()
         
         self.assertIsNone(lux)
     
     def test_calculate_brightness_dark(self):
         """Test brightness calculation in dark conditions"""
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         brightness = sensor.calculate_brightness(5.0, 10, 100)  # Very dark
         
@@ -90,7 +154,7 @@ class TestLightSensor(unittest.TestCase):
     
     def test_calculate_brightness_bright(self):
         """Test brightness calculation in bright conditions"""
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         brightness = sensor.calculate_brightness(2000.0, 10, 100)  # Very bright
         
@@ -98,17 +162,16 @@ class TestLightSensor(unittest.TestCase):
     
     def test_calculate_brightness_medium(self):
         """Test brightness calculation in medium conditions"""
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         brightness = sensor.calculate_brightness(500.0, 10, 100)  # Medium light
         
-        self.assertGreater(brightness, 10)
-        self.assertLess(brightness, 100)
-        self.assertAlmostEqual(brightness, 54, delta=5)  # Approximately middle
+        # 10 + 90 * (500 - 10) / (1000 - 10) = 54.5, truncated to a whole percentage
+        self.assertEqual(brightness, 54)
     
     def test_calculate_brightness_none_input(self):
         """Test brightness calculation with None input"""
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         
         brightness = sensor.calculate_brightness(None, 10, 100)
         
@@ -116,11 +179,9 @@ class TestLightSensor(unittest.TestCase):
     
     def test_get_auto_brightness(self):
         """Test automatic brightness calculation"""
-        mock_bus = MagicMock()
-        mock_bus.read_i2c_block_data.return_value = [0x01, 0x2C]  # 300 raw value
-        self.mock_smbus.SMBus.return_value = mock_bus
+        self.bus.payload = [0x01, 0x2C]  # 300 raw value
         
-        sensor = self.LightSensor()
+        sensor = LightSensor()
         brightness = sensor.get_auto_brightness(20, 80)
         
         self.assertGreaterEqual(brightness, 20)
@@ -130,98 +191,69 @@ class TestLightSensor(unittest.TestCase):
 class TestLightSensorIntegration(unittest.TestCase):
     """Integration tests for light sensor with LED controller"""
     
+    # Controller settings shared by the tests; each test overrides only what it varies
+    LED_CONFIG = {
+        **LED_STRIP_CONFIG,
+        "light_sensor_update_interval": 1,
+        "min_brightness": 20,
+        "max_brightness": 80
+    }
+    
     def setUp(self):
         """Set up test environment"""
-        # Mock all hardware dependencies
-        self.mock_smbus = MagicMock()
-        self.mock_rpi_ws281x = MagicMock()
-        
-        self.patchers = [
-            patch.dict('sys.modules', {'smbus2': self.mock_smbus}),
-            patch.dict('sys.modules', {'rpi_ws281x': self.mock_rpi_ws281x})
-        ]
-        
-        for patcher in self.patchers:
-            patcher.start()
+        # Clear calls and configured behavior left by the previous test
+        _mock_smbus.reset_mock(return_value=True, side_effect=True)
+        _mock_rpi_ws281x.reset_mock(return_value=True, side_effect=True)
+        self.mock_smbus = _mock_smbus
+        self.mock_rpi_ws281x = _mock_rpi_ws281x
+        
+        # Mock successful sensor initialization and the LED strip
+        self.bus = FakeBus()
+        self.mock_smbus.SMBus.return_value = self.bus
+        self.strip = FakeStrip(self.LED_CONFIG["led_count"])
+        self.mock_rpi_ws281x.PixelStrip.return_value = self.strip
     
-    def tearDown(self):
-        """Clean up test environment"""
-        for patcher in self.patchers:
-            patcher.stop()
+    def _make_controller(self, **overrides):
+        """Build a light sensor and an LED controller using it
+        
+        Args:
+            **overrides: Config values replacing those in LED_CONFIG
+            
+        Returns:
+            tuple: (light_sensor, led_controller)
+        """
+        light_sensor = LightSensor()
+        led_controller = LEDController({**self.LED_CONFIG, **overrides}, light_sensor)
+        self.addCleanup(led_controller.close)
+        return light_sensor, led_controller
     
     def test_led_controller_with_light_sensor(self):
         """Test LED controller integration with light sensor"""
-        from light_sensor import LightSensor
-        from metar_monitor import LEDController
-        
-        # Mock successful sensor initialization
-        mock_bus = MagicMock()
-        self.mock_smbus.SMBus.return_value = mock_bus
-        
-        # Mock LED strip
-        mock_strip = MagicMock()
-        self.mock_rpi_ws281x.PixelStrip.return_value = mock_strip
-        
-        config = {
-            "led_count": 10,
-            "led_pin": 18,
-            "led_freq_hz": 800000,
-            "led_dma": 10,
-            "led_invert": False,
-            "led_brightness": 50,
-            "led_channel": 0,
-            "light_sensor_update_interval": 1,
-            "min_brightness": 20,
-            "max_brightness": 80
-        }
-        
-        light_sensor = LightSensor()
-        led_controller = LEDController(config, light_sensor)
+        light_sensor, led_controller = self._make_controller()
         
         self.assertTrue(led_controller.initialized)
         self.assertEqual(led_controller.light_sensor, light_sensor)
     
     def test_brightness_update_timing(self):
         """Test that brightness updates respect timing intervals"""
-        from light_sensor import LightSensor
-        from metar_monitor import LEDController
-        import time
-        
-        # Mock successful sensor initialization
-        mock_bus = MagicMock()
-        mock_bus.read_i2c_block_data.return_value = [0x02, 0x58]  # 600 raw value
-        self.mock_smbus.SMBus.return_value = mock_bus
-        
-        # Mock LED strip
-        mock_strip = MagicMock()
-        self.mock_rpi_ws281x.PixelStrip.return_value = mock_strip
-        
-        config = {
-            "led_count": 10,
-            "led_pin": 18,
-            "led_freq_hz": 800000,
-            "led_dma": 10,
-            "led_invert": False,
-            "led_brightness": 50,
-            "led_channel": 0,
-            "light_sensor_update_interval": 60,  # Long interval
-            "min_brightness": 20,
-            "max_brightness": 80
-        }
-        
-        light_sensor = LightSensor()
-        led_controller = LEDController(config, light_sensor)
-        
-        # First update should work
-        led_controller.update_brightness()
-        first_call_count = mock_strip.setBrightness.call_count
-        
-        # Immediate second update should be skipped
-        led_controller.update_brightness()
-        second_call_count = mock_strip.setBrightness.call_count
-        
-        self.assertEqual(first_call_count, second_call_count)
-
+        self.bus.payload = [0x02, 0x58]  # 600 raw value
+        
+        # Virtual monotonic clock, so the interval is tested without real waiting
+        with patch.object(metar_monitor.time, 'monotonic', return_value=1000.0) as mock_clock:
+            light_sensor, led_controller = self._make_controller(light_sensor_update_interval=60)  # Long interval
+            
+            # The initial clear() commits a frame, which reads the sensor once
+            first_read_count = self.bus.reads
+            self.assertEqual(first_read_count, 1)
+            
+            # Second update within the interval should be skipped
+            led_controller.update_brightness()
+            self.assertEqual(self.bus.reads, first_read_count)
+            
+            # Once the interval has passed the sensor is read again
+            mock_clock.return_value = 1100.0
+            led_controller.update_brightness()
+            self.assertEqual(self.bus.reads, first_read_count + 1)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
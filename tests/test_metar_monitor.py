@@ -4,285 +4,214 @@ Unit tests for METAR Status Monitor
 """
 
 import unittest
-import json
-import sys
 import os
 import re
-from unittest.mock import patch, MagicMock, mock_open
+import json
+import shutil
+import tempfile
+from types import MappingProxyType
+from unittest.mock import patch, Mock, MagicMock, DEFAULT
 from datetime import datetime
 
-# Add the parent directory to the path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import metar_monitor
 from metar_monitor import METARStatus, LEDController
+from metar_api_client import METARAPIClient
+from tests.fixtures import BASE_CONFIG, LED_STRIP_CONFIG
 import constants
 
 
-class TestFlightCategoryDetermination(unittest.TestCase):
-    """Tests for flight category determination methods"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        mock_config = {
-            "airports": [
-                {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0},
-                {"icao": "KBFI", "name": "Boeing Field", "led": 1}
-            ],
-            "led_count": 10,
-            "forecast_hours": [6, 12, 24],
-            "metar_url": "https://aviationweather.gov/api/data/metar",
-            "taf_url": "https://aviationweather.gov/api/data/taf"
-        }
-        
-        # Mock the logger and API client
-        with patch('logging.getLogger') as mock_logger:
-            with patch('metar_monitor.METARAPIClient') as mock_api_client:
-                self.metar_status = METARStatus(mock_config)
-                # Replace the real API client with a mock
-                self.metar_status.api_client = mock_api_client.return_value
+# Test configurations built on the shared fixtures; read-only proxies guard
+# against a test changing them for the rest of the module
 
+# Configuration for the LED summary tests, with visited flags on the airports
+_VISITED_CONFIG = MappingProxyType({
+    **BASE_CONFIG,
+    "airports": [
+        {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0, "visited": True},
+        {"icao": "KBFI", "name": "Boeing Field", "led": 1, "visited": False},
+        {"icao": "KPAE", "name": "Paine Field", "led": 2, "visited": False}
+    ],
+    "forecast_hours": [4, 8, 12]
+})
 
-class TestStatusColorDetermination(unittest.TestCase):
-    """Tests for status color determination"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        mock_config = {
-            "airports": [
-                {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0},
-                {"icao": "KBFI", "name": "Boeing Field", "led": 1}
-            ],
-            "led_count": 10,
-            "metar_url": "https://aviationweather.gov/api/data/metar",
-            "taf_url": "https://aviationweather.gov/api/data/taf",
-            "light_sensor_update_interval": 30,
-            "min_brightness": 10,
-            "max_brightness": 100
-        }
-        
-        # Mock the logger and API client
-        with patch('logging.getLogger') as mock_logger:
-            with patch('metar_monitor.METARAPIClient') as mock_api_client:
-                with patch('metar_monitor.LightSensor') as mock_light_sensor:
-                    self.metar_status = METARStatus(mock_config)
-                    # Replace the real API client with a mock
-                    self.metar_status.api_client = mock_api_client.return_value
-    
-    def test_determine_status_color_flight_category(self):
-        """Test status color based on flight category"""
-        self.assertEqual(
-            self.metar_status.determine_status_color("KSEA 010000Z 26005KT 10SM FEW100", "VFR"),
-            "GREEN"
-        )
-        self.assertEqual(
-            self.metar_status.determine_status_color("KSEA 010000Z 26005KT 4SM FEW100", "MVFR"),
-            "BLUE"
-        )
-        self.assertEqual(
-            self.metar_status.determine_status_color("KSEA 010000Z 26005KT 2SM FEW100", "IFR"),
-            "RED"
-        )
-        self.assertEqual(
-            self.metar_status.determine_status_color("KSEA 010000Z 26005KT 1/2SM FEW100", "LIFR"),
-            "PURPLE"
-        )
-
-
-class TestHelperMethods(unittest.TestCase):
-    """Tests for helper methods"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        mock_config = {
-            "airports": [
-                {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0},
-                {"icao": "KBFI", "name": "Boeing Field", "led": 1}
-            ],
-            "led_count": 10,
-            "metar_url": "https://aviationweather.gov/api/data/metar",
-            "taf_url": "https://aviationweather.gov/api/data/taf"
-        }
-        
-        # Mock the logger and API client
-        with patch('logging.getLogger') as mock_logger:
-            with patch('metar_monitor.METARAPIClient') as mock_api_client:
-                self.metar_status = METARStatus(mock_config)
-                # Replace the real API client with a mock
-                self.metar_status.api_client = mock_api_client.return_value
+
+class _StubLightSensor:
+    """Minimal stand-in for LightSensor that reports no sensor present"""
+
+    available = False
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_auto_brightness(self, min_brightness=10, max_brightness=100):
+        return max_brightness
+
+    def close(self):
+        pass
+
+
+# The API client and the light sensor are patched once for the whole module
+# rather than around each METARStatus construction
+_mock_api_client = Mock(spec=METARAPIClient)
+_module_patchers = [
+    patch('airport_data_manager.METARAPIClient', return_value=_mock_api_client),
+    patch('metar_monitor.LightSensor', _StubLightSensor)
+]
+
+
+def _build_metar_status(config):
+    """Construct a METARStatus using the module's mocked API client"""
+    return METARStatus(config)
+
+
+def setUpModule():
+    """Install the module patches"""
+    for patcher in _module_patchers:
+        patcher.start()
+
+
+def tearDownModule():
+    """Remove the module patches"""
+    for patcher in reversed(_module_patchers):
+        patcher.stop()
+
+
+# Airport data for the LED summary tests - only KSEA has data, others don't
+_AIRPORT_DATA_TEMPLATE = MappingProxyType({
+    "KSEA": MappingProxyType({
+        "raw_metar": "KSEA 010000Z 26005KT 10SM FEW100",
+        "flight_category": "VFR",
+        "status_color": "GREEN",
+        "name": "Seattle-Tacoma Intl",
+        "forecasts": MappingProxyType({
+            4: MappingProxyType({"color": "BLUE", "category": "MVFR"}),
+            8: MappingProxyType({"color": "RED", "category": "IFR"})
+        })
+    })
+})
 
 
 class TestLEDSummary(unittest.TestCase):
     """Tests for LED summary display functionality"""
     
-    def setUp(self):
-        """Set up test environment"""
-        mock_config = {
-            "airports": [
-                {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0, "visited": True},
-                {"icao": "KBFI", "name": "Boeing Field", "led": 1, "visited": False},
-                {"icao": "KPAE", "name": "Paine Field", "led": 2, "visited": False}
-            ],
-            "led_count": 10,
-            "forecast_hours": [4, 8, 12],
-
-            "metar_url": "https://aviationweather.gov/api/data/metar",
-            "taf_url": "https://aviationweather.gov/api/data/taf"
-        }
-        
-        with patch('logging.getLogger') as mock_logger:
-            with patch('metar_monitor.METARAPIClient') as mock_api_client:
-                self.metar_status = METARStatus(mock_config)
-                self.metar_status.api_client = mock_api_client.return_value
-                
-        # Set up test data - only KSEA has data, others don't
-        self.metar_status.airport_data = {
-            "KSEA": {
-                "raw_metar": "KSEA 010000Z 26005KT 10SM FEW100",
-                "flight_category": "VFR",
-                "status_color": "GREEN",
-                "name": "Seattle-Tacoma Intl",
-                "forecasts": {
-                    4: {"color": "BLUE", "category": "MVFR"},
-                    8: {"color": "RED", "category": "IFR"}
-                }
-            }
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Set up one METARStatus shared by the tests in this class"""
+        cls.metar_status = _build_metar_status(_VISITED_CONFIG)
+        # The summary only reads the airport data, so the frozen template is used as is
+        cls.metar_status.data_manager.airport_data = _AIRPORT_DATA_TEMPLATE
     
-    @patch('builtins.print')
-    def test_print_led_summary_airports_visited_mode(self, mock_print):
+    def test_print_led_summary_airports_visited_mode(self):
         """Test LED summary in Airports Visited mode"""
-        self.metar_status.display_mode = metar_monitor.DisplayMode.AIRPORTS_VISITED
-        self.metar_status.print_led_summary()
+        self.metar_status.mode_manager.display_mode = metar_monitor.DisplayMode.AIRPORTS_VISITED
+        captured = []
+        with patch('builtins.print', side_effect=lambda *args, **kwargs: captured.append(" ".join(map(str, args)))):
+            self.metar_status.print_led_summary()
         
-        print_calls = [call[0][0] for call in mock_print.call_args_list if call[0]]
-        led_lines = [line for line in print_calls if line.startswith("LED")]
+        # LED lines read "LED <n>: <indicator> <ICAO> - <status> - <name>"; key them by ICAO
+        led_lines = {line.split(" - ", 1)[0].split()[-1]: line
+                     for line in captured if line.startswith("LED ")}
         
         # KSEA should show as "Visited", others as "Not Visited"
-        self.assertTrue(any("KSEA" in line and "Visited" in line for line in led_lines))
-        self.assertTrue(any("KBFI" in line and "Not Visited" in line for line in led_lines))
-        self.assertTrue(any("KPAE" in line and "Not Visited" in line for line in led_lines))
+        self.assertIn("Visited", led_lines.get("KSEA", ""))
+        self.assertNotIn("Not Visited", led_lines.get("KSEA", ""))
+        self.assertIn("Not Visited", led_lines.get("KBFI", ""))
+        self.assertIn("Not Visited", led_lines.get("KPAE", ""))
 
 
-class TestTAFProcessing(unittest.TestCase):
-    """Tests for TAF processing"""
-    
+class TestLEDController(unittest.TestCase):
+    """Tests for LED controller frame updates"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Install the LED colors used by the tests"""
+        cls.colors = patch.dict(metar_monitor.LED_COLORS, {"OFF": 0, "GREEN": 1})
+        cls.colors.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the LED colors"""
+        cls.colors.stop()
+
     def setUp(self):
-        """Set up test environment"""
-        mock_config = {
-            "airports": [
-                {"icao": "KSEA", "name": "Seattle-Tacoma Intl", "led": 0},
-            ],
-            "led_count": 10,
-            "forecast_hours": [6, 12],
-            "metar_url": "https://aviationweather.gov/api/data/metar",
-            "taf_url": "https://aviationweather.gov/api/data/taf"
-        }
-        
-        # Mock the logger and API client
-        with patch('logging.getLogger') as mock_logger:
-            with patch('metar_monitor.METARAPIClient') as mock_api_client:
-                self.metar_status = METARStatus(mock_config)
-                # Replace the real API client with a mock
-                self.metar_status.api_client = mock_api_client.return_value
-                
-        # Initialize airport data
-        self.metar_status.airport_data = {
-            "KSEA": {
-                "raw_metar": "KSEA 010000Z 26005KT 10SM FEW100",
-                "flight_category": "VFR",
-                "status_color": "GREEN",
-                "name": "Seattle-Tacoma Intl"
-            }
-        }
-    
-    def test_get_most_recent_taf(self):
-        """Test getting the most recent TAF"""
-        # Test with mostRecent flag
-        taf_list = [
-            {"icaoId": "KSEA", "rawTAF": "TAF1", "mostRecent": 0},
-            {"icaoId": "KSEA", "rawTAF": "TAF2", "mostRecent": 1},
-            {"icaoId": "KSEA", "rawTAF": "TAF3", "mostRecent": 0}
-        ]
-        most_recent = self.metar_status._get_most_recent_taf(taf_list)
-        self.assertEqual(most_recent["rawTAF"], "TAF2")
-        
-        # Test without mostRecent flag
-        taf_list = [
-            {"icaoId": "KSEA", "rawTAF": "TAF1"},
-            {"icaoId": "KSEA", "rawTAF": "TAF2"},
-            {"icaoId": "KSEA", "rawTAF": "TAF3"}
-        ]
-        most_recent = self.metar_status._get_most_recent_taf(taf_list)
-        self.assertEqual(most_recent["rawTAF"], "TAF1")  # Should return first entry
-        
-        # Test empty list
-        self.assertIsNone(self.metar_status._get_most_recent_taf([]))
+        """Set up an LED controller on a mocked strip"""
+        with patch.multiple(metar_monitor, LED_ENABLED=True, PixelStrip=DEFAULT, create=True):
+            self.controller = LEDController(LED_STRIP_CONFIG, light_sensor=MagicMock())
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.controller.close()
+
+    def test_brightness_updated_once_per_commit(self):
+        """Test that brightness is checked once per frame, not once per LED"""
+        self.controller.update_brightness = MagicMock()
+
+        self.controller.set_led(0, "GREEN")
+        self.controller.set_leds([(1, "GREEN"), (2, "GREEN")])
+        self.controller.update_brightness.assert_not_called()
+
+        self.controller.commit()
+        self.controller.update_brightness.assert_called_once()
+
+
+# Config file contents loaded by the existing-file test
+CONFIG_FILE_DATA = {
+    "airports": [{"icao": "KTEST", "name": "Test Airport", "led": 0}],
+    "led_count": 5
+}
+
+# (description, config file name, config file contents or None to leave it
+# missing) for configs that must exit
+CONFIG_ERROR_CASES = (
+    ("missing file", "missing.json", None),
+    ("invalid JSON", "invalid.json", "invalid json"),
+)
 
 
 class TestConfigLoading(unittest.TestCase):
     """Tests for configuration loading"""
     
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open, read_data='{"airports": [{"icao": "KTEST", "name": "Test Airport", "led": 0}], "led_count": 5}')
-    @patch('json.load')
-    def test_load_config_existing_file(self, mock_json_load, mock_file_open, mock_exists):
+    @classmethod
+    def setUpClass(cls):
+        """Write the config files read by the tests into a temporary directory"""
+        cls.config_dir = tempfile.mkdtemp()
+        cls.valid_config = cls._write_config("config.json", json.dumps(CONFIG_FILE_DATA))
+        for _, name, contents in CONFIG_ERROR_CASES:
+            if contents is not None:
+                cls._write_config(name, contents)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary config directory"""
+        shutil.rmtree(cls.config_dir)
+    
+    @classmethod
+    def _write_config(cls, name, contents):
+        """Write a config file and return its path"""
+        path = os.path.join(cls.config_dir, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+    
+    def test_load_config_existing_file(self):
         """Test loading an existing config file"""
-        # Set up the test
-        mock_exists.return_value = True
-        mock_config = {
-            "airports": [{"icao": "KTEST", "name": "Test Airport", "led": 0}],
-            "led_count": 5
-        }
-        mock_json_load.return_value = mock_config
-        
-        # Call the function
-        config = metar_monitor.load_config()
-        
-        # Verify the result
-        mock_exists.assert_called_once_with(metar_monitor.CONFIG_FILE)
-        mock_file_open.assert_called_once_with(metar_monitor.CONFIG_FILE, 'r')
-        mock_json_load.assert_called_once()
+        with patch('sys.exit') as mock_exit:
+            config = metar_monitor.load_config(self.valid_config)
         
+        mock_exit.assert_not_called()
         # Should have exactly what's in the config file
-        self.assertEqual(config["airports"], [{"icao": "KTEST", "name": "Test Airport", "led": 0}])
-        self.assertEqual(config["led_count"], 5)
-        self.assertEqual(config, mock_config)
+        self.assertEqual(config, CONFIG_FILE_DATA)
     
-    @patch('os.path.exists')
-    @patch('builtins.print')
-    @patch('sys.exit')
-    def test_load_config_nonexistent_file(self, mock_exit, mock_print, mock_exists):
-        """Test that the application exits when config file doesn't exist"""
-        # Set up the test
-        mock_exists.return_value = False
-        
-        # Call the function - should exit
-        metar_monitor.load_config()
-        
-        # Verify the result
-        mock_exists.assert_called_once_with(metar_monitor.CONFIG_FILE)
-        mock_exit.assert_called_once_with(1)
-        mock_print.assert_called_once()  # Should print an error message
-        
-    @patch('os.path.exists')
-    @patch('builtins.open', mock_open(read_data="invalid json"))
-    @patch('json.load')
-    @patch('builtins.print')
-    @patch('sys.exit')
-    def test_load_config_invalid_json(self, mock_exit, mock_print, mock_json_load, mock_exists):
-        """Test that the application exits when config file contains invalid JSON"""
-        # Set up the test
-        mock_exists.return_value = True
-        mock_json_load.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        
-        # Call the function - should exit
-        metar_monitor.load_config()
-        
-        # Verify the result
-        mock_exists.assert_called_once_with(metar_monitor.CONFIG_FILE)
-        mock_exit.assert_called_once_with(1)
-        mock_print.assert_called_once()  # Should print an error message
-
+    def test_load_config_errors_exit(self):
+        """Test that the application exits when the config file is missing or invalid"""
+        for description, name, _ in CONFIG_ERROR_CASES:
+            with self.subTest(description), \
+                 patch('builtins.print') as mock_print, \
+                 patch('sys.exit') as mock_exit:
+                metar_monitor.load_config(os.path.join(self.config_dir, name))
+                
+                mock_exit.assert_called_once_with(1)
+                mock_print.assert_called_once()  # Should print an error message
 
 if __name__ == "__main__":
     unittest.main()
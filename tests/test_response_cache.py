@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Response Cache module
+"""
+
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+
+from response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    """Tests for ResponseCache class"""
+
+    def setUp(self):
+        """Set up a temporary cache directory"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.cache_dir, ttl=60, stale_window=60)
+
+    def tearDown(self):
+        """Remove the temporary cache directory"""
+        shutil.rmtree(self.cache_dir)
+
+    def _age_entry(self, key, seconds):
+        """Backdate a cache file's modification time"""
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        mtime = time.time() - seconds
+        os.utime(path, (mtime, mtime))
+
+    def test_miss_fetches_and_stores(self):
+        """Test that a missing entry is fetched and written to disk"""
+        fetch = MagicMock(return_value=[{"icaoId": "KSEA"}])
+
+        data = self.cache.get("metar", ["KSEA"], fetch)
+
+        self.assertEqual(data, [{"icaoId": "KSEA"}])
+        fetch.assert_called_once()
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, "metar.json")))
+
+    def test_fresh_entry_skips_fetch(self):
+        """Test that a fresh entry is served without fetching"""
+        self.cache.get("metar", ["KSEA"], MagicMock(return_value=["old"]))
+        fetch = MagicMock(return_value=["new"])
+
+        data = self.cache.get("metar", ["KSEA"], fetch)
+
+        self.assertEqual(data, ["old"])
+        fetch.assert_not_called()
+
+    def test_stale_entry_served_while_refreshing(self):
+        """Test that a stale entry is returned and refreshed in the background"""
+        self.cache.get("metar", ["KSEA"], MagicMock(return_value=["old"]))
+        self._age_entry("metar", 90)
+        fetch = MagicMock(return_value=["new"])
+
+        data = self.cache.get("metar", ["KSEA"], fetch)
+
+        self.assertEqual(data, ["old"])
+        for _ in range(100):
+            if not self.cache._refreshing:
+                break
+            time.sleep(0.01)
+        fetch.assert_called_once()
+        self.assertEqual(self.cache.get("metar", ["KSEA"], MagicMock()), ["new"])
+
+    def test_expired_entry_fetched_synchronously(self):
+        """Test that an entry past the stale window is refetched before returning"""
+        self.cache.get("metar", ["KSEA"], MagicMock(return_value=["old"]))
+        self._age_entry("metar", 150)
+
+        data = self.cache.get("metar", ["KSEA"], MagicMock(return_value=["new"]))
+
+        self.assertEqual(data, ["new"])
+
+    def test_different_airports_is_a_miss(self):
+        """Test that an entry cached for other airports is not reused"""
+        self.cache.get("metar", ["KSEA"], MagicMock(return_value=["old"]))
+
+        data = self.cache.get("metar", ["KSEA", "KBFI"], MagicMock(return_value=["new"]))
+
+        self.assertEqual(data, ["new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
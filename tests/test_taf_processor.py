@@ -4,18 +4,60 @@ Unit tests for TAF Processor module
 """
 
 import unittest
-import sys
-import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from datetime import datetime, timedelta
 
-# Add the parent directory to the path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import taf_processor
 
+# (wind direction, wind speed, expected formatted wind)
+FORMAT_WIND_CASES = (
+    # Normal case and padding
+    (270, 15, "27015"),
+    (90, 5, "09005"),
+    # None values
+    (None, None, "-----"),
+    (None, 10, "---10"),
+    (270, None, "270--"),
+    # String values
+    ("270", "15", "27015"),
+    # Non-numeric strings
+    ("VRB", "15", "VRB15"),
+    # Conversion errors
+    ("xxx", "yyy", "xxxyyy"),
+)
+
+# (description, clouds, expected format_clouds_info output)
+FORMAT_CLOUDS_CASES = (
+    ("normal case", [{"cover": "BKN", "base": 3000}, {"cover": "OVC", "base": 5000}], "BKN3000 OVC5000"),
+    ("empty list", [], ""),
+    ("missing values", [{"cover": "BKN"}, {"base": 5000}], ""),
+    ("None input", None, ""),
+)
+
+# (description, clouds) for further cloud layers checked only against the separate helpers
+SCAN_CLOUDS_EXTRA_CASES = (
+    ("lowest ceiling", [{"cover": "FEW", "base": 1000}, {"cover": "BKN", "base": 2500}, {"cover": "OVC", "base": 800}]),
+    ("unparsable base", [{"cover": "OVC", "base": 300}, {"cover": "BKN", "base": "bad"}]),
+    ("missing bases", [{"cover": "BKN", "base": None}, {"cover": "SCT"}]),
+)
+
+
 class TestTAFProcessor(unittest.TestCase):
     """Tests for TAF processor module"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared forecast period fixtures once"""
+        # Period boundaries are derived from the naive reference time rather
+        # than hard-coded, so they match the local timezone the tests run in
+        cls._mock_now = datetime(2023, 6, 1, 12, 0, 0)
+        now_ts = int(cls._mock_now.timestamp())
+        cls._forecast_periods = [
+            {"timeFrom": now_ts - 3600, "timeTo": now_ts + 3 * 3600},
+            {"timeFrom": now_ts + 3 * 3600, "timeTo": now_ts + 9 * 3600},
+            {"timeFrom": now_ts + 9 * 3600, "timeTo": now_ts + 12 * 3600}
+        ]
+    
     def test_get_most_recent_taf(self):
         """Test getting the most recent TAF"""
         # Test with mostRecent flag
@@ -39,96 +81,113 @@ class TestTAFProcessor(unittest.TestCase):
         # Test empty list
         self.assertIsNone(taf_processor.get_most_recent_taf([]))
     
-    @patch('taf_processor.datetime')
-    def test_find_relevant_forecast_period(self, mock_datetime):
+    def test_find_relevant_forecast_period(self):
         """Test finding the relevant forecast period"""
-        # Mock the current time
-        mock_now = datetime(2023, 6, 1, 12, 0, 0)
-        mock_datetime.now.return_value = mock_now
-        mock_datetime.fromtimestamp.side_effect = lambda x: datetime.fromtimestamp(x)
-        
-        # Create test target time
-        target_time = mock_now + timedelta(hours=6)
-        
         # Test with matching period
-        forecast_periods = [
-            {
-                "timeFrom": int((mock_now - timedelta(hours=1)).timestamp()),
-                "timeTo": int((mock_now + timedelta(hours=3)).timestamp())
-            },
-            {
-                "timeFrom": int((mock_now + timedelta(hours=3)).timestamp()),
-                "timeTo": int((mock_now + timedelta(hours=9)).timestamp())
-            },
-            {
-                "timeFrom": int((mock_now + timedelta(hours=9)).timestamp()),
-                "timeTo": int((mock_now + timedelta(hours=12)).timestamp())
-            }
-        ]
-        
-        period, from_time = taf_processor.find_relevant_forecast_period(forecast_periods, target_time)
-        self.assertEqual(period, forecast_periods[1])
+        period, from_time = taf_processor.find_relevant_forecast_period(
+            self._forecast_periods, self._mock_now + timedelta(hours=6))
+        self.assertIs(period, self._forecast_periods[1])
+        self.assertEqual(from_time, self._mock_now + timedelta(hours=3))
         
         # Test with no matching period
-        target_time = mock_now + timedelta(hours=24)
-        period, from_time = taf_processor.find_relevant_forecast_period(forecast_periods, target_time)
-        self.assertIsNone(period)
-        self.assertIsNone(from_time)
+        self.assertEqual(taf_processor.find_relevant_forecast_period(
+            self._forecast_periods, self._mock_now + timedelta(hours=24)), (None, None))
         
         # Test with missing or invalid times
-        forecast_periods = [
-            {"timeFrom": None, "timeTo": None}
-        ]
-        period, from_time = taf_processor.find_relevant_forecast_period(forecast_periods, target_time)
-        self.assertIsNone(period)
-        self.assertIsNone(from_time)
+        self.assertEqual(taf_processor.find_relevant_forecast_period(
+            [{"timeFrom": None, "timeTo": None}], self._mock_now), (None, None))
 
-    def test_format_clouds_info(self):
-        """Test formatting cloud information"""
-        # Test normal case
-        clouds = [
-            {"cover": "BKN", "base": 3000},
-            {"cover": "OVC", "base": 5000}
+    def test_find_forecast_period_at(self):
+        """Test finding a forecast period from pre-parsed epoch times"""
+        periods = [
+            {"timeFrom": 1000, "timeTo": 2000},
+            {"timeFrom": "2000", "timeTo": "3000"},
+            {"timeFrom": "bad", "timeTo": 4000},
+            {"timeFrom": None, "timeTo": 5000}
         ]
-        self.assertEqual(
-            taf_processor.format_clouds_info(clouds),
-            "BKN3000 OVC5000"
-        )
+        periods_epoch = taf_processor.parse_forecast_periods(periods)
+        self.assertEqual([(tf, tt) for tf, tt, _ in periods_epoch], [(1000, 2000), (2000, 3000)])
         
-        # Test empty list
-        self.assertEqual(taf_processor.format_clouds_info([]), "")
+        period, from_time, to_time = taf_processor.find_forecast_period_at(periods_epoch, 2500)
+        self.assertIs(period, periods[1])
+        self.assertEqual(from_time, datetime.fromtimestamp(2000))
+        self.assertEqual(to_time, datetime.fromtimestamp(3000))
         
-        # Test missing values
-        clouds = [
-            {"cover": "BKN"},
-            {"base": 5000}
-        ]
-        self.assertEqual(taf_processor.format_clouds_info(clouds), "")
+        self.assertEqual(taf_processor.find_forecast_period_at(periods_epoch, 3500), (None, None, None))
+        
+        # Binary search gives the same first match, including on a shared boundary
+        period_ends = taf_processor.period_end_index(periods_epoch)
+        self.assertEqual(period_ends, [2000, 3000])
+        for target_ts in (500, 1000, 2000, 2500, 3000, 3500):
+            self.assertEqual(taf_processor.find_forecast_period_at(periods_epoch, target_ts, period_ends),
+                             taf_processor.find_forecast_period_at(periods_epoch, target_ts))
         
-        # Test None input
-        self.assertEqual(taf_processor.format_clouds_info(None), "")
+        # Overlapping TEMPO-style periods fall back to the linear scan
+        overlapping = taf_processor.parse_forecast_periods([
+            {"timeFrom": 1000, "timeTo": 3000},
+            {"timeFrom": 1500, "timeTo": 2000}
+        ])
+        self.assertIsNone(taf_processor.period_end_index(overlapping))
+
+    def test_get_period_index_reuses_parsed_periods(self):
+        """Test that the same raw TAF is parsed only once"""
+        periods = [{"timeFrom": 1000, "timeTo": 2000}]
+        with patch.dict(taf_processor._period_index_cache, clear=True), \
+             patch('taf_processor.parse_forecast_periods', wraps=taf_processor.parse_forecast_periods) as mock_parse:
+            first = taf_processor.get_period_index("KSEA", "TAF KSEA", periods)
+            second = taf_processor.get_period_index("KSEA", "TAF KSEA", periods)
+            self.assertIs(first, second)
+            mock_parse.assert_called_once()
+            
+            # A changed TAF is parsed again
+            taf_processor.get_period_index("KSEA", "TAF KSEA AMD", periods)
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_format_clouds_info(self):
+        """Test formatting cloud information"""
+        for description, clouds, expected in FORMAT_CLOUDS_CASES:
+            with self.subTest(description):
+                self.assertEqual(taf_processor.format_clouds_info(clouds), expected)
 
     def test_format_wind(self):
         """Test wind formatting"""
-        # Test normal case
-        self.assertEqual(taf_processor.format_wind(270, 15), "27015")
-        
-        # Test padding
-        self.assertEqual(taf_processor.format_wind(90, 5), "09005")
-        
-        # Test None values
-        self.assertEqual(taf_processor.format_wind(None, None), "------")
-        self.assertEqual(taf_processor.format_wind(None, 10), "---10")
-        self.assertEqual(taf_processor.format_wind(270, None), "270--")
-        
-        # Test string values
-        self.assertEqual(taf_processor.format_wind("270", "15"), "27015")
+        for wdir, wspd, expected in FORMAT_WIND_CASES:
+            with self.subTest(wdir=wdir, wspd=wspd):
+                self.assertEqual(taf_processor.format_wind(wdir, wspd), expected)
+
+    def test_process_forecast_period_reuses_slot(self):
+        """Test that a pre-allocated forecast slot is filled in place"""
+        from_time = datetime(2023, 6, 1, 12, 0, 0)
+        period = {
+            "fcstChange": "FM",
+            "timeFrom": int(from_time.timestamp()),
+            "timeTo": int((from_time + timedelta(hours=6)).timestamp()),
+            "wdir": 270,
+            "wspd": 15,
+            "visib": "6+",
+            "clouds": [{"cover": "BKN", "base": 2500}]
+        }
+        slot = taf_processor.new_forecast_slot()
         
-        # Test non-numeric strings
-        self.assertEqual(taf_processor.format_wind("VRB", "15"), "VRB15")
+        result = taf_processor.process_forecast_period(period, from_time, target=slot)
         
-        # Test conversion errors
-        self.assertEqual(taf_processor.format_wind("xxx", "yyy"), "xxxyyy")
+        self.assertIs(result, slot)
+        self.assertEqual(slot["category"], "MVFR")
+        self.assertEqual(slot["time_from"], from_time)
+        self.assertIs(slot["raw_data"], period)
+
+    def test_scan_clouds_matches_separate_helpers(self):
+        """Test that the single cloud pass agrees with format_clouds_info and determine_forecast_category"""
+        # The None-input row is left out, as determine_forecast_category expects a list
+        format_cases = tuple((description, clouds) for description, clouds, _ in FORMAT_CLOUDS_CASES
+                             if clouds is not None)
+        for description, clouds in format_cases + SCAN_CLOUDS_EXTRA_CASES:
+            with self.subTest(description):
+                clouds_str, ceiling = taf_processor._scan_clouds(clouds)
+                period = {"visib": "6+", "clouds": clouds}
+                self.assertEqual(clouds_str, taf_processor.format_clouds_info(clouds))
+                self.assertEqual(taf_processor.determine_flight_category_from_values(6.0, ceiling),
+                                 taf_processor.determine_forecast_category(period))
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,13 +4,10 @@ Unit tests for Weather Status module
 """
 
 import unittest
-import sys
-import os
 from unittest.mock import patch
 import re
 
-# Add the parent directory to the path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import weather_status
 from weather_status import determine_status_color, get_warning_text
 
 class TestWeatherStatus(unittest.TestCase):
@@ -131,6 +128,24 @@ class TestWeatherStatus(unittest.TestCase):
         )
         self.assertEqual(warning_text, "")
 
+    def test_scan_weather_cached_by_text(self):
+        """Test that a repeated report is answered from the scan cache"""
+        raw_text = "KSEA 010000Z 27015G30KT 10SM TSRA FEW100"
+        weather_status._scan_weather.cache_clear()
+        
+        self.assertEqual(get_warning_text("YELLOW", raw_text), " - Thunderstorm")
+        self.assertEqual(determine_status_color(raw_text, "VFR"), "YELLOW")
+        
+        info = weather_status._scan_weather.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1))
+        self.assertEqual(weather_status._scan_weather(raw_text), (True, "15", "30"))
+
+    def test_patterns_compiled_at_module_level(self):
+        """Test that the weather patterns are compiled once at import"""
+        for name in ("_WINDS_RE", "_GUSTS_RE", "_TS_RE"):
+            with self.subTest(name):
+                self.assertIsInstance(getattr(weather_status, name), re.Pattern)
+
 
 if __name__ == "__main__":
     unittest.main()
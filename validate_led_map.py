@@ -9,11 +9,10 @@ dupes = []
 for ap in cfg.get("airports", []):
     idx = ap["led"]
     if idx in airport_leds:
-        dupes.append((idx, airport_leds[idx]["icao"], ap["icao"]))
-    airport_leds[idx] = ap
+        dupes.append((idx, airport_leds[idx], ap["icao"]))
+    airport_leds[idx] = ap["icao"]  # led -> icao
 
-all_leds = set(range(LED_COUNT))
-unmapped = sorted(all_leds - legend_leds - set(airport_leds.keys()))
+unmapped = [i for i in range(LED_COUNT) if i not in legend_leds and i not in airport_leds]
 
 print(f"LED_COUNT: {LED_COUNT}")
 print(f"Legend LEDs: {sorted(legend_leds)}")
@@ -28,6 +27,6 @@ if dupes:
 problem = [14,17,24,25,27,30,32,34,37,41]
 print("\nProblem indices mapping:")
 for i in problem:
-    ap = airport_leds.get(i)
-    print(f"  {i}: {'MAPPED to '+ap['icao'] if ap else 'UNMAPPED'}")
+    icao = airport_leds.get(i)
+    print(f"  {i}: {'MAPPED to '+icao if icao else 'UNMAPPED'}")
 
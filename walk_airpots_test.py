@@ -17,19 +17,21 @@ W = Color(64,64,64)
 OFF = Color(0,0,0)
 
 airports = sorted(cfg["airports"], key=lambda a: a["led"])
+# clear the whole strip once; after that only the previously lit LED needs turning off
+for j in range(LED_COUNT): setpix(j, OFF)
+prev_lit = None
 for ap in airports:
     i = ap["led"]
     name = f'{ap.get("icao","?")} ({i})'
-    # clear
-    for j in range(LED_COUNT): setpix(j, OFF)
+    if prev_lit is not None: setpix(prev_lit, OFF)
     # light only the airport’s configured LED
     setpix(i, W)
+    prev_lit = i
     strip.show()
     print("Lighting", name)
     time.sleep(0.35)
 
 # finish with everything on for mapped airports
-for j in range(LED_COUNT): setpix(j, OFF)
 for ap in airports: setpix(ap["led"], W)
 strip.show()
 
@@ -5,12 +5,41 @@ Handles determining status colors and generating warning text
 """
 
 import re
-import logging
-from typing import Dict, Any, Optional, Union
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 
 from constants import THRESHOLDS, CATEGORY_COLOR_MAP, REGEX_PATTERNS
 
-logger = logging.getLogger(__name__)
+# All thunderstorm indicators compiled into one alternation so a report is
+# scanned once instead of once per indicator
+_TS_RE = re.compile("|".join(re.escape(pattern) for pattern in REGEX_PATTERNS["THUNDERSTORM"]))
+
+# Wind and gust patterns compiled once at import rather than looked up per call
+_WINDS_RE = re.compile(REGEX_PATTERNS["WINDS"])
+_GUSTS_RE = re.compile(REGEX_PATTERNS["GUSTS"])
+
+
+@lru_cache(maxsize=512)
+def _scan_weather(raw_text: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Scan a report once for the tokens that can raise a weather warning
+    
+    A report stays the same across refreshes until a new one is issued, and a
+    TAF summary is shared by every forecast hour it covers, so results are
+    cached by text.
+    
+    Args:
+        raw_text: Raw METAR/TAF string
+        
+    Returns:
+        tuple: (thunderstorm, wind speed, gust speed) - whether a thunderstorm
+               indicator is present, and the knots of the first wind group and
+               the first gust group as written, or None if there is none
+    """
+    wind_match = _WINDS_RE.search(raw_text)
+    gust_match = _GUSTS_RE.search(raw_text) if "G" in raw_text else None
+    return (_TS_RE.search(raw_text) is not None,
+            wind_match.group(1) if wind_match else None,
+            gust_match.group(1) if gust_match else None)
 
 
 def determine_status_color(raw_weather_text: str, flight_category: str, wind_data: Dict = None) -> str:
@@ -32,26 +61,22 @@ def determine_status_color(raw_weather_text: str, flight_category: str, wind_dat
     
     # Check for strong winds, gusts, or thunderstorms
     if raw_weather_text:
+        thunderstorm, wind, gust = _scan_weather(raw_weather_text)
+        
         # Check for winds over threshold knots
-        wind_match = re.search(REGEX_PATTERNS["WINDS"], raw_weather_text)
-        if wind_match and int(wind_match.group(1)) > THRESHOLDS["WINDS"]:
+        if wind is not None and int(wind) > THRESHOLDS["WINDS"]:
             return "YELLOW"
         
         # Check for gusts over threshold knots
-        gust_match = re.search(REGEX_PATTERNS["GUSTS"], raw_weather_text)
-        if gust_match and int(gust_match.group(1)) > THRESHOLDS["GUSTS"]:
+        if gust is not None and int(gust) > THRESHOLDS["GUSTS"]:
             return "YELLOW"
         
         # Check for thunderstorms
-        if any(pattern in raw_weather_text for pattern in REGEX_PATTERNS["THUNDERSTORM"]):
+        if thunderstorm:
             return "YELLOW"
     
-    # Then check flight category and map to appropriate color
-    if flight_category in CATEGORY_COLOR_MAP:
-        return CATEGORY_COLOR_MAP[flight_category]
-    
-    # Default if we can't determine
-    return "OFF"
+    # Then map the flight category to its color, defaulting to OFF if we can't determine it
+    return CATEGORY_COLOR_MAP.get(flight_category, "OFF")
 
 
 def get_warning_text(status_color: str, raw_text: str, airport_id: str = None, wind_data: Dict = None, config: Dict = None) -> str:
@@ -70,31 +95,29 @@ def get_warning_text(status_color: str, raw_text: str, airport_id: str = None, w
     if status_color != "YELLOW":
         return ""
         
-    # Check if we have wind data with crosswind information
-    if wind_data and "crosswind" in wind_data and "active_runway" in wind_data and "direction" in wind_data:
-        crosswind = wind_data["crosswind"]
-        runway = wind_data["active_runway"]["name"]
-        wind_direction = wind_data["direction"]
-        threshold = 10  # Default - should be from config in real use
-        if config:
-            threshold = config.get("crosswind_threshold", 10)
+    # Check if we have wind data with crosswind information; calculate_airport_crosswind
+    # only sets the crosswind together with the active runway and a known direction
+    crosswind = wind_data.get("crosswind") if wind_data else None
+    if crosswind is not None:
+        # Default - should be from config in real use
+        threshold = config.get("crosswind_threshold", 10) if config else 10
             
         if crosswind > threshold:
-            return f" - Crosswind {crosswind:.1f}KT from {wind_direction:03d}° on RWY {runway}"
+            return f" - Crosswind {crosswind:.1f}KT from {wind_data['direction']:03d}° on RWY {wind_data['active_runway']['name']}"
+    
+    thunderstorm, wind, gust = _scan_weather(raw_text)
     
     # Check for thunderstorms (highest priority)
-    if any(pattern in raw_text for pattern in REGEX_PATTERNS["THUNDERSTORM"]):
+    if thunderstorm:
         return " - Thunderstorm"
         
     # Check for gusts (second priority)
-    if "G" in raw_text and re.search(REGEX_PATTERNS["GUSTS"], raw_text):
-        gust_match = re.search(REGEX_PATTERNS["GUSTS"], raw_text)
-        return f" - Gusts {gust_match.group(1)}KT"
+    if gust is not None:
+        return f" - Gusts {gust}KT"
         
     # Check for strong winds (third priority)
-    if re.search(REGEX_PATTERNS["WINDS"], raw_text):
-        wind_match = re.search(REGEX_PATTERNS["WINDS"], raw_text)
-        return f" - Winds {wind_match.group(1)}KT"
+    if wind is not None:
+        return f" - Winds {wind}KT"
         
     # Default warning if we can't determine the specific reason
     return " - Weather warning"